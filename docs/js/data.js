@@ -401,7 +401,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "written",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "쓰다",
           "example": "Could you check my written answer?"
         },
         {
@@ -636,7 +636,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "cheaper",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "싼",
           "example": "I need to find a cheaper option."
         },
         {
@@ -646,7 +646,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "broken",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "부수다",
           "example": "I need to fix my broken laptop."
         },
         {
@@ -781,7 +781,7 @@ const PATTERNS_DATA = {
       "vocabulary": [
         {
           "word": "forgot",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "잊다",
           "example": "I forgot to bring my thick jacket."
         },
         {
@@ -796,17 +796,17 @@ const PATTERNS_DATA = {
         },
         {
           "word": "forgot",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "잊다",
           "example": "I forgot to water the indoor plants."
         },
         {
           "word": "forgot",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "잊다",
           "example": "I forgot to turn off the bright lights."
         },
         {
           "word": "healthier",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "건강한",
           "example": "I'm trying to eat healthier food."
         },
         {
@@ -1446,7 +1446,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "taking",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "가져가다/타다",
           "example": "I feel like taking a long nap."
         },
         {
@@ -1531,7 +1531,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "waking",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "깨다",
           "example": "I'm tired of waking up early daily."
         },
         {
@@ -1746,7 +1746,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "understood",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "이해하다",
           "example": "I'm not sure if he understood clearly."
         },
         {
@@ -1891,7 +1891,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "earlier",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "일찍",
           "example": "Why don't we meet a bit earlier?"
         },
         {
@@ -1926,7 +1926,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "taking",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "가져가다/타다",
           "example": "How about taking the scenic route?"
         },
         {
@@ -1936,12 +1936,12 @@ const PATTERNS_DATA = {
         },
         {
           "word": "sharing",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "공유하다",
           "example": "Would you mind sharing your opinion?"
         },
         {
           "word": "moving",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "움직이다",
           "example": "Would you mind moving your bag?"
         },
         {
@@ -2361,7 +2361,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "coming",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "오다",
           "example": "I don't think she's coming today."
         },
         {
@@ -2381,7 +2381,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "coming",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "오다",
           "example": "It seems like rain is coming soon."
         },
         {
@@ -2576,7 +2576,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "changing",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "바꾸다",
           "example": "I agree that the rules need changing."
         },
         {
@@ -2806,7 +2806,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "saving",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "구하다/저축하다",
           "example": "I've been saving up for a new laptop."
         },
         {
@@ -2821,7 +2821,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "realized",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "깨닫다",
           "example": "I just realized I forgot my umbrella."
         },
         {
@@ -3016,7 +3016,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "apologized",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "사과하다",
           "example": "I already apologized for my behavior."
         },
         {
@@ -3201,7 +3201,7 @@ const PATTERNS_DATA = {
       "vocabulary": [
         {
           "word": "better",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "좋은",
           "example": "It's better to be honest than silent."
         },
         {
@@ -3211,7 +3211,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "better",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "좋은",
           "example": "It's better to travel light anyway."
         },
         {
@@ -3231,17 +3231,17 @@ const PATTERNS_DATA = {
         },
         {
           "word": "easier",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "쉬운",
           "example": "It's easier to cook simple meals."
         },
         {
           "word": "easier",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "쉬운",
           "example": "It's easier to work in a quiet space."
         },
         {
           "word": "easier",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "쉬운",
           "example": "It's easier to remember visual things."
         },
         {
@@ -3486,7 +3486,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "shared",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "공유하다",
           "example": "It's the same as our shared goal."
         },
         {
@@ -3921,7 +3921,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "apologizing",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "사과하다",
           "example": "I ended up apologizing first anyway."
         },
         {
@@ -4341,7 +4341,7 @@ const PATTERNS_DATA = {
         },
         {
           "word": "changing",
-          "meaning": "단어 뜻 확인하기",
+          "meaning": "바꾸다",
           "example": "There's nothing wrong with changing plans."
         },
         {
@@ -56,9 +56,61 @@ async function speakText(text, lang, event) {
 
   const finishSpeaking = () => btn?.classList.remove('speaking');
 
+  // 사전 렌더링된 오디오가 있으면 우선 사용, 없으면 브라우저 TTS
+  const audioUrl = await findPrerenderedAudio(text, lang);
+  if (audioUrl) {
+    playAudioFile(audioUrl, () => playBrowserTTS(text, lang, finishSpeaking), finishSpeaking);
+    return;
+  }
+
   playBrowserTTS(text, lang, finishSpeaking);
 }
 
+// ===== 사전 렌더링 오디오 (prerender_audio.py → docs/audio/) =====
+let audioManifest; // undefined: 아직 안 불러옴, null: 없음
+let currentAudio = null;
+
+async function loadAudioManifest() {
+  if (audioManifest === undefined) {
+    audioManifest = await fetch('audio/manifest.json')
+      .then(res => res.ok ? res.json() : null)
+      .catch(() => null);
+  }
+  return audioManifest;
+}
+
+// 서버 tts.audio_key()와 같은 규칙: sha256("lang|voice|speed|text")
+async function findPrerenderedAudio(text, lang) {
+  if (!window.crypto?.subtle) return null;
+  const manifest = await loadAudioManifest();
+  const settings = manifest?.settings?.[lang];
+  if (!settings) return null;
+
+  const raw = `${lang}|${settings.voice}|${settings.speed.toFixed(2)}|${text}`;
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(raw));
+  const key = [...new Uint8Array(digest)].map(b => b.toString(16).padStart(2, '0')).join('');
+  const item = manifest.items[key];
+  return item ? `audio/${item.file}` : null;
+}
+
+function playAudioFile(url, onError, finishSpeaking) {
+  window.speechSynthesis?.cancel();
+  currentAudio?.pause();
+
+  // onerror와 play() 실패가 둘 다 올 수 있으므로 한 번만 처리
+  let failed = false;
+  const fail = () => {
+    if (failed) return;
+    failed = true;
+    onError();
+  };
+
+  currentAudio = new Audio(url);
+  currentAudio.onended = finishSpeaking;
+  currentAudio.onerror = fail;
+  currentAudio.play().catch(fail);
+}
+
 function playBrowserTTS(text, lang, finishSpeaking) {
   if (!('speechSynthesis' in window)) {
     alert('이 브라우저는 음성 재생을 지원하지 않습니다.');
@@ -67,6 +119,7 @@ function playBrowserTTS(text, lang, finishSpeaking) {
   }
 
   speechSynthesis.cancel();
+  currentAudio?.pause();
 
   const utterance = new SpeechSynthesisUtterance(text);
   utterance.lang = lang === 'ko' ? 'ko-KR' : 'en-US';
@@ -153,7 +206,9 @@ A: would는 "~할 텐데", could는 "~할 수 있을 텐데". would가 더 확
 
 절대 길게 설명하지 마. 친구한테 카톡하듯이 짧게!`;
 
-let chatHistory = [];
+// 대화 기록은 서버 세션에 보관 - 클라이언트는 세션 ID와 새 메시지만 보냄
+let chatSessionId = sessionStorage.getItem('KONGDAN_CHAT_SESSION') || '';
+const CHAT_API_BASE = 'http://localhost:3001';
 
 function initChatbot() {
   const fab = document.getElementById('chatFab');
@@ -179,38 +234,46 @@ function initChatbot() {
     const loadingId = addChatMessage('bot', '', true);
 
     try {
-      // 대화 기록 구성
-      const history = chatHistory.map(h => ({
-        role: h.role === 'model' ? 'assistant' : h.role,
-        text: h.parts[0].text
-      }));
-
-      // 백엔드 API 호출 (Vertex AI Gemini)
-      const response = await fetch('http://localhost:3001/api/chat', {
+      // 백엔드 스트리밍 API 호출 (Vertex AI Gemini, Server-Sent Events)
+      const response = await fetch(`${CHAT_API_BASE}/api/chat/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: text, history })
+        body: JSON.stringify({ message: text, session_id: chatSessionId, day: currentDay })
       });
 
-      const data = await response.json();
+      // 너무 자주 보냈거나(429) 서버가 붐빔(503) - Retry-After 초 뒤에 다시
+      if (response.status === 429 || response.status === 503) {
+        document.getElementById(loadingId)?.remove();
+        const wait = response.headers.get('Retry-After') || '몇';
+        addChatMessage('bot', `⏳ 지금 질문이 많이 몰렸어요. ${wait}초 뒤에 다시 보내주세요!`);
+        return;
+      }
+
+      let replyId = null;
+      const data = await readChatStream(response, partial => {
+        // 첫 토큰이 오면 스피너를 말풍선으로 교체하고 이후엔 텍스트만 갱신
+        if (!replyId) {
+          document.getElementById(loadingId)?.remove();
+          replyId = addChatMessage('bot', '');
+        }
+        document.querySelector(`#${replyId} p`).textContent = partial;
+      });
       console.log('Chat response:', data);
 
       // 로딩 메시지 제거
       document.getElementById(loadingId)?.remove();
 
       if (data.error) {
+        if (replyId) removeMessage(replyId);
         addChatMessage('bot', `⚠️ 오류: ${data.error}`);
         return;
       }
 
       if (data.reply) {
-        addChatMessage('bot', data.reply);
-        chatHistory.push({ role: 'user', parts: [{ text }] });
-        chatHistory.push({ role: 'model', parts: [{ text: data.reply }] });
-
-        // 대화 기록 20개로 제한
-        if (chatHistory.length > 20) {
-          chatHistory = chatHistory.slice(-20);
+        if (!replyId) addChatMessage('bot', data.reply);
+        if (data.session_id && data.session_id !== chatSessionId) {
+          chatSessionId = data.session_id;
+          sessionStorage.setItem('KONGDAN_CHAT_SESSION', chatSessionId);
         }
       } else {
         addChatMessage('bot', '응답이 없어요. 서버를 확인해주세요.');
@@ -228,9 +291,49 @@ function initChatbot() {
   };
 }
 
+// SSE 응답을 읽으면서 부분 텍스트를 onDelta로 전달, 마지막 done/error 이벤트 데이터를 반환
+async function readChatStream(response, onDelta) {
+  if (!response.ok || !response.body) {
+    return response.json();
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let partial = '';
+  let result = {};
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // 이벤트는 빈 줄(\n\n)로 구분됨
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const payload = raw.match(/^data: (.*)$/m)?.[1];
+      if (!payload) continue;
+      const data = JSON.parse(payload);
+
+      if (event === 'chunk') {
+        partial += data.text;
+        onDelta(partial);
+      } else if (event === 'done' || event === 'error') {
+        result = data;
+      }
+    }
+  }
+
+  return result;
+}
+
 function addChatMessage(type, text, isLoading = false) {
   const container = document.getElementById('chatMessages');
-  const id = 'msg_' + Date.now();
+  const id = 'msg_' + Date.now() + '_' + Math.floor(Math.random() * 1000);
   const div = document.createElement('div');
   div.id = id;
   div.className = `chat-message ${type}${isLoading ? ' loading' : ''}`;
@@ -252,17 +355,93 @@ function removeMessage(id) {
 }
 
 // ===== 초기화 =====
-document.addEventListener('DOMContentLoaded', () => {
+document.addEventListener('DOMContentLoaded', async () => {
   loadFromStorage();
+  // 다른 기기에서 바뀐 진행 상황 반영 (첫 동기화 응답이 데이터 로딩보다 먼저 올 수 있음)
+  onSyncChange(() => {
+    loadFromStorage();
+    if (!patternsData) return;
+    renderDaySelector();
+    if (patternsData.days.find(d => d.day === currentDay)?.patterns) {
+      renderPatterns();
+      updateProgress();
+    }
+  });
   initTTS();
   initSettingsUI();
   initChatbot();
-  patternsData = PATTERNS_DATA;
+  patternsData = await loadPatternIndex();
   renderDaySelector();
+  await ensureDayLoaded(currentDay);
   renderPatterns();
   updateProgress();
+  prefetchNextDay(currentDay);
 });
 
+// ===== 데이터 로딩 (Day별 chunk: update_vocab_meanings.py --format chunked/both) =====
+const DATA_DIR = 'data';
+const dayChunkRequests = {};
+
+// manifest(Day 목록/제목/해시)만 먼저 받고, 각 Day 내용은 필요할 때 받음
+async function loadPatternIndex() {
+  // data.js를 포함한 페이지(단일 파일 모드)면 그대로 사용
+  if (typeof PATTERNS_DATA !== 'undefined') return PATTERNS_DATA;
+
+  try {
+    const res = await fetch(`${DATA_DIR}/manifest.json`, { cache: 'no-cache' });
+    if (!res.ok) throw new Error(`manifest ${res.status}`);
+    const manifest = await res.json();
+    manifest.days = manifest.days.map(d => ({ ...d, patternCount: d.patterns, patterns: null }));
+    return manifest;
+  } catch (e) {
+    // file://로 열었거나 chunk가 없으면 단일 파일로 대체
+    console.warn('Day chunk manifest 로드 실패, data.js 사용:', e);
+    await loadScript('js/data.js');
+    return PATTERNS_DATA;
+  }
+}
+
+function loadScript(src) {
+  return new Promise((resolve, reject) => {
+    const script = document.createElement('script');
+    script.src = src;
+    script.onload = resolve;
+    script.onerror = reject;
+    document.head.appendChild(script);
+  });
+}
+
+// 같은 Day를 동시에 여러 번 요청해도 fetch는 한 번만
+function ensureDayLoaded(day) {
+  const dayData = patternsData.days.find(d => d.day === day);
+  if (!dayData || dayData.patterns) return Promise.resolve(dayData);
+
+  if (!dayChunkRequests[day]) {
+    // 해시를 쿼리스트링으로 붙여서 내용이 바뀌면 브라우저 캐시를 건너뜀
+    dayChunkRequests[day] = fetch(`${DATA_DIR}/${dayData.file}?v=${dayData.hash}`)
+      .then(res => {
+        if (!res.ok) throw new Error(`Day ${day} ${res.status}`);
+        return res.json();
+      })
+      .then(chunk => Object.assign(dayData, chunk))
+      .catch(e => {
+        delete dayChunkRequests[day];
+        throw e;
+      });
+  }
+  return dayChunkRequests[day];
+}
+
+// 다음 Day는 브라우저가 한가할 때 미리 받아둠
+function prefetchNextDay(day) {
+  const next = patternsData.days.find(d => d.day === day + 1);
+  if (!next || next.patterns) return;
+
+  const prefetch = () => ensureDayLoaded(next.day).catch(() => {});
+  if ('requestIdleCallback' in window) requestIdleCallback(prefetch);
+  else setTimeout(prefetch, 500);
+}
+
 // ===== 로컬 스토리지 =====
 function loadFromStorage() {
   const saved = localStorage.getItem(STORAGE_KEY);
@@ -306,7 +485,7 @@ function renderDaySelector() {
   }).join('');
 }
 
-function selectDay(day) {
+async function selectDay(day) {
   if (!isDayUnlocked(day)) {
     showLockedMessage();
     return;
@@ -318,8 +497,19 @@ function selectDay(day) {
     btn.classList.toggle('active', parseInt(btn.dataset.day) === day);
   });
 
+  try {
+    await ensureDayLoaded(day);
+  } catch (e) {
+    console.error('Day load error:', e);
+    showToast('⚠️ Day 데이터를 불러오지 못했어요. 다시 시도해주세요.');
+    return;
+  }
+  // 로딩 중에 다른 Day를 눌렀으면 그쪽이 그림
+  if (currentDay !== day) return;
+
   renderPatterns();
   updateProgress();
+  prefetchNextDay(day);
 }
 
 function showLockedMessage() {
@@ -348,7 +538,7 @@ function renderPatterns() {
   }
 
   const dayData = patternsData.days.find(d => d.day === currentDay);
-  if (!dayData) return;
+  if (!dayData || !dayData.patterns) return;
 
   const cleared = clearedDays.has(currentDay);
 
@@ -482,9 +672,11 @@ function toggleExample(itemId) {
   if (completedItems.has(itemId)) {
     completedItems.delete(itemId);
     element.classList.remove('completed');
+    syncDelete('completed', itemId);
   } else {
     completedItems.add(itemId);
     element.classList.add('completed');
+    syncPut('completed', itemId);
     if (completedItems.size % 10 === 0) showCelebration();
   }
 
@@ -499,7 +691,7 @@ function toggleExample(itemId) {
 
 function updateProgress() {
   const dayData = patternsData.days.find(d => d.day === currentDay);
-  if (!dayData) return;
+  if (!dayData || !dayData.patterns) return;
 
   const totalCount = dayData.patterns.reduce((sum, p) => sum + p.examples.length, 0);
   let completed = 0;
@@ -8,9 +8,12 @@ let wrongAnswers = [];
 let clearedDays = new Set();
 let recognition = null;
 let isListening = false;
+let speechAlternatives = []; // 마지막 음성 인식 결과의 후보들 (maxAlternatives)
+let isChecking = false;
 
 const WRONG_KEY = 'patternEnglish_wrong';
 const CLEARED_KEY = 'patternEnglish_cleared';
+const GRADE_API_BASE = 'http://localhost:3001';
 
 document.addEventListener('DOMContentLoaded', () => {
   loadClearedDays();
@@ -65,6 +68,7 @@ function initSpeechRecognition() {
       const transcript = event.results[i][0].transcript;
       if (event.results[i].isFinal) {
         finalTranscript += transcript;
+        speechAlternatives = Array.from(event.results[i], alt => alt.transcript.trim());
       } else {
         interimTranscript += transcript;
       }
@@ -160,12 +164,12 @@ function startQuiz() {
   const day = patternsData.days.find(d => d.day === currentDay);
   let allExamples = [];
 
-  day.patterns.forEach(p => p.examples.forEach(ex => allExamples.push({ ...ex, patternTitle: p.title, patternColor: p.color })));
+  day.patterns.forEach(p => p.examples.forEach((ex, idx) => allExamples.push({ ...ex, id: `${currentDay}_${p.id}_${idx}`, patternTitle: p.title, patternColor: p.color })));
   allExamples = allExamples.sort(() => Math.random() - 0.5);
 
   questions = allExamples.slice(0, count).map(ex => {
     let qType = type === 'mixed' ? (Math.random() > 0.5 ? 'korean' : 'english') : type;
-    return { ...ex, type: qType, question: qType === 'korean' ? ex.korean : ex.english, answer: qType === 'korean' ? ex.english : ex.korean };
+    return { ...ex, type: qType, question: qType === 'korean' ? ex.korean : ex.english, answer: qType === 'korean' ? ex.english : ex.korean, answerLang: qType === 'korean' ? 'en' : 'ko' };
   });
 
   currentIndex = 0; correctCount = 0; wrongAnswers = [];
@@ -187,6 +191,7 @@ function showQuestion() {
   document.getElementById('feedback').className = 'feedback';
   document.getElementById('checkBtn').style.display = 'block';
   document.getElementById('nextBtn').style.display = 'none';
+  speechAlternatives = [];
 
   // 마이크 버튼 표시
   const micBtn = document.getElementById('micBtn');
@@ -197,7 +202,8 @@ function showQuestion() {
   }
 }
 
-function checkAnswer() {
+async function checkAnswer() {
+  if (isChecking) return;
   // 음성 인식 중이면 중지
   if (recognition && isListening) {
     recognition.stop();
@@ -209,20 +215,33 @@ function checkAnswer() {
   const correctAnswer = q.answer.toLowerCase().replace(/[.,!?]/g, '');
 
   // 유연한 정답 체크 (공백, 구두점 무시)
-  const isCorrect = userAnswer === correctAnswer ||
+  let isCorrect = userAnswer === correctAnswer ||
     userAnswer.replace(/\s+/g, '') === correctAnswer.replace(/\s+/g, '');
 
+  // 그대로 맞지 않으면 서버 채점 (음성 인식 후보 전부 + 비슷한 단어 허용, 단어별 차이)
+  let graded = null;
+  if (!isCorrect) {
+    isChecking = true;
+    const alternatives = [...new Set([input.value.trim(), ...speechAlternatives].filter(Boolean))];
+    graded = (await gradeAnswers([{ id: q.id, lang: q.answerLang, alternatives }]))?.[0];
+    isChecking = false;
+    if (graded && !graded.error) isCorrect = graded.correct;
+  }
+
   const feedback = document.getElementById('feedback');
 
   if (isCorrect) {
     correctCount++;
+    // 예전에 틀렸던 문장을 맞히면 복습 일정 연장
+    if (isSavedWrong(q.english)) syncReview(q.english, 4);
     input.className = 'answer-input correct';
     feedback.className = 'feedback correct';
-    feedback.innerHTML = '✓ 정답입니다!';
+    feedback.innerHTML = graded && graded.score < 1 ? `✓ 정답입니다! (${Math.round(graded.score * 100)}점)<br>정답: <strong>${q.answer}</strong>` : '✓ 정답입니다!';
   } else {
     input.className = 'answer-input wrong';
     feedback.className = 'feedback wrong';
     feedback.innerHTML = `✗ 오답<br>정답: <strong>${q.answer}</strong>`;
+    if (graded && graded.diff) feedback.innerHTML += `<br>${renderGradeDiff(graded.diff)}`;
     wrongAnswers.push(q);
     saveWrongAnswer(q);
   }
@@ -257,6 +276,7 @@ function showResult() {
   if (isPerfect && isFullQuiz) {
     clearedDays.add(currentDay);
     saveClearedDays();
+    syncPut('cleared', currentDay);
     emoji = '🎉'; message = `Day ${currentDay} 클리어! Day ${currentDay + 1}이 해금되었습니다!`;
     document.getElementById('resultArea').innerHTML = `
       <div class="result-card cleared">
@@ -288,10 +308,46 @@ function showResult() {
   }
 }
 
+// ===== 서버 채점 (POST /api/grade) - 서버가 없으면 null =====
+async function gradeAnswers(items) {
+  try {
+    const response = await fetch(`${GRADE_API_BASE}/api/grade`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ items }),
+    });
+    return response.ok ? (await response.json()).results : null;
+  } catch (e) {
+    return null;
+  }
+}
+
+function escapeHtml(text) {
+  return text.replace(/[&<>"']/g, ch => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[ch]));
+}
+
+// 단어별 차이: 맞은 단어는 그대로, 틀린/빠진 단어는 표시
+function renderGradeDiff(diff) {
+  return diff.map(d => {
+    if (d.op === 'equal') return `<span class="diff-equal">${escapeHtml(d.expected)}</span>`;
+    if (d.op === 'extra') return `<span class="diff-extra">${escapeHtml(d.actual)}</span>`;
+    if (d.op === 'missing') return `<span class="diff-missing">${escapeHtml(d.expected)}</span>`;
+    return `<span class="diff-wrong" title="${escapeHtml(d.actual || '')}">${escapeHtml(d.expected)}</span>`;
+  }).join(' ');
+}
+
+function isSavedWrong(english) {
+  return JSON.parse(localStorage.getItem(WRONG_KEY) || '[]').some(w => w.english === english);
+}
+
 function saveWrongAnswer(q) {
   let wrongs = JSON.parse(localStorage.getItem(WRONG_KEY) || '[]');
   if (!wrongs.find(w => w.english === q.english)) {
-    wrongs.push({ english: q.english, korean: q.korean, patternTitle: q.patternTitle, patternColor: q.patternColor, day: currentDay, timestamp: Date.now() });
+    const item = { english: q.english, korean: q.korean, patternTitle: q.patternTitle, patternColor: q.patternColor, day: currentDay, timestamp: Date.now() };
+    wrongs.push(item);
     localStorage.setItem(WRONG_KEY, JSON.stringify(wrongs));
+    syncPut('wrong', q.english, item);
+  } else {
+    syncReview(q.english, 1); // 또 틀림 → 복습 일정 처음부터
   }
 }
@@ -6,6 +6,7 @@ let wrongItems = [];
 let bookmarkItems = [];
 let flashcardItems = [];
 let flashcardIndex = 0;
+let flashcardGrading = false; // 오늘 복습 모드: 이전/다음 대신 몰랐어요/알았어요
 
 // ===== Init =====
 document.addEventListener('DOMContentLoaded', () => {
@@ -13,6 +14,14 @@ document.addEventListener('DOMContentLoaded', () => {
     renderLists();
     setupTabs();
     setupFlashcard();
+    refreshDueCount();
+
+    // 다른 기기에서 바뀐 목록 반영
+    onSyncChange(() => {
+        loadData();
+        renderLists();
+        refreshDueCount();
+    });
 });
 
 function loadData() {
@@ -114,8 +123,10 @@ function toggleBookmark(index, source) {
 
     if (existIndex >= 0) {
         bookmarkItems.splice(existIndex, 1);
+        syncDelete('bookmark', item.english);
     } else {
         bookmarkItems.push({ ...item });
+        syncPut('bookmark', item.english, { ...item });
     }
 
     localStorage.setItem(BOOKMARK_KEY, JSON.stringify(bookmarkItems));
@@ -124,6 +135,7 @@ function toggleBookmark(index, source) {
 }
 
 function deleteWrong(index) {
+    syncDelete('wrong', wrongItems[index].english);
     wrongItems.splice(index, 1);
     localStorage.setItem(WRONG_KEY, JSON.stringify(wrongItems));
     loadData();
@@ -131,6 +143,7 @@ function deleteWrong(index) {
 }
 
 function deleteBookmark(index) {
+    syncDelete('bookmark', bookmarkItems[index].english);
     bookmarkItems.splice(index, 1);
     localStorage.setItem(BOOKMARK_KEY, JSON.stringify(bookmarkItems));
     loadData();
@@ -143,6 +156,9 @@ function setupFlashcard() {
     document.getElementById('flashcard').onclick = flipCard;
     document.getElementById('flashPrev').onclick = prevFlashcard;
     document.getElementById('flashNext').onclick = nextFlashcard;
+    document.getElementById('flashForgot').onclick = () => gradeFlashcard(1);
+    document.getElementById('flashKnew').onclick = () => gradeFlashcard(4);
+    document.getElementById('dueReviewBtn').onclick = startDueReview;
 
     document.addEventListener('keydown', e => {
         if (document.getElementById('flashcardMode').style.display === 'none') return;
@@ -163,6 +179,7 @@ function setupFlashcard() {
 function startFlashcard(source, startIndex) {
     flashcardItems = source === 'wrong' ? [...wrongItems] : [...bookmarkItems];
     flashcardIndex = startIndex || 0;
+    flashcardGrading = false;
 
     if (flashcardItems.length === 0) return;
 
@@ -170,6 +187,37 @@ function startFlashcard(source, startIndex) {
     showFlashcard();
 }
 
+// ===== 오늘 복습 (서버 SM-2 일정) =====
+async function refreshDueCount() {
+    const result = await fetchDueReviews(1);
+    const btn = document.getElementById('dueReviewBtn');
+    btn.style.display = result && result.total_due > 0 ? 'inline-block' : 'none';
+    document.getElementById('dueCount').textContent = result ? result.total_due : 0;
+}
+
+async function startDueReview() {
+    const result = await fetchDueReviews(50);
+    if (!result || result.items.length === 0) return;
+
+    flashcardItems = result.items.map(item => item.data).filter(Boolean);
+    flashcardIndex = 0;
+    flashcardGrading = true;
+    if (flashcardItems.length === 0) return;
+
+    document.getElementById('flashcardMode').style.display = 'flex';
+    showFlashcard();
+}
+
+function gradeFlashcard(grade) {
+    syncReview(flashcardItems[flashcardIndex].english, grade);
+    if (flashcardIndex < flashcardItems.length - 1) {
+        flashcardIndex++;
+        showFlashcard();
+    } else {
+        closeFlashcard();
+    }
+}
+
 function showFlashcard() {
     const item = flashcardItems[flashcardIndex];
     const card = document.getElementById('flashcard');
@@ -178,6 +226,11 @@ function showFlashcard() {
     document.getElementById('flashcardFront').textContent = item.korean;
     document.getElementById('flashcardBack').textContent = item.english;
     document.getElementById('flashcardProgress').textContent = `${flashcardIndex + 1} / ${flashcardItems.length}`;
+
+    document.getElementById('flashPrev').style.display = flashcardGrading ? 'none' : '';
+    document.getElementById('flashNext').style.display = flashcardGrading ? 'none' : '';
+    document.getElementById('flashForgot').style.display = flashcardGrading ? '' : 'none';
+    document.getElementById('flashKnew').style.display = flashcardGrading ? '' : 'none';
 }
 
 function flipCard() {
@@ -200,4 +253,5 @@ function nextFlashcard() {
 
 function closeFlashcard() {
     document.getElementById('flashcardMode').style.display = 'none';
+    if (flashcardGrading) refreshDueCount();
 }
@@ -0,0 +1,181 @@
+// ===== 진행 상황 동기화 (server/backend.py POST /api/progress/sync) =====
+// 바뀐 항목만(delta) 대기열에 모아 몇 초에 한 번 묶어서 보내고, 다른 기기에서 바뀐 것을 받아
+// localStorage에 반영한다. 서버가 없거나 오프라인이면 대기열에 남겨뒀다가 다음에 보낸다.
+// 다른 기기와 이어서 하려면 같은 동기화 코드로 접속: review.html?sync=<코드>
+const SYNC_API_BASE = 'http://localhost:3001';
+const SYNC_USER_KEY = 'KONGDAN_SYNC_USER';
+const SYNC_QUEUE_KEY = 'KONGDAN_SYNC_QUEUE';
+const SYNC_CURSOR_KEY = 'KONGDAN_SYNC_CURSOR';
+const SYNC_SEEDED_KEY = 'KONGDAN_SYNC_SEEDED';
+const SYNC_DELAY_MS = 2000;
+const SYNC_MAX_OPS = 500;
+
+// 종류별 localStorage 저장 위치 (list: [{english, ...}] 목록, 아니면 id 배열)
+const SYNC_STORAGE = {
+  wrong: { key: 'patternEnglish_wrong', list: true },
+  bookmark: { key: 'patternEnglish_bookmark', list: true },
+  completed: { key: 'patternEnglish_completed' },
+  cleared: { key: 'patternEnglish_cleared', numeric: true },
+};
+
+let syncQueue = JSON.parse(localStorage.getItem(SYNC_QUEUE_KEY) || '[]');
+let syncCursor = parseInt(localStorage.getItem(SYNC_CURSOR_KEY) || '0', 10);
+let syncTimer = null;
+let syncInFlight = false;
+const syncListeners = [];
+
+const syncUserId = (() => {
+  const fromUrl = new URLSearchParams(location.search).get('sync');
+  if (fromUrl && /^[A-Za-z0-9_-]{8,64}$/.test(fromUrl) && fromUrl !== localStorage.getItem(SYNC_USER_KEY)) {
+    localStorage.setItem(SYNC_USER_KEY, fromUrl);
+    localStorage.setItem(SYNC_CURSOR_KEY, '0'); // 다른 코드로 바꾸면 처음부터 받아옴
+    syncCursor = 0;
+  }
+  let id = localStorage.getItem(SYNC_USER_KEY);
+  if (!id) {
+    id = crypto.randomUUID ? crypto.randomUUID().replace(/-/g, '')
+      : Array.from(crypto.getRandomValues(new Uint8Array(16)), b => b.toString(16).padStart(2, '0')).join('');
+    localStorage.setItem(SYNC_USER_KEY, id);
+  }
+  return id;
+})();
+
+// 동기화 기능 전부터 localStorage에 있던 항목을 한 번만 대기열에 올림
+// ts 0 → 서버에 이미 더 나중 값이 있으면 그쪽이 이김
+(function seedSyncQueue() {
+  if (localStorage.getItem(SYNC_SEEDED_KEY)) return;
+  const seeds = [];
+  for (const [kind, storage] of Object.entries(SYNC_STORAGE)) {
+    const values = JSON.parse(localStorage.getItem(storage.key) || '[]');
+    values.forEach(value => {
+      if (storage.list) {
+        if (value && value.english) seeds.push({ op: 'put', kind, id: String(value.english), data: value, ts: 0 });
+      } else {
+        seeds.push({ op: 'put', kind, id: String(value), data: true, ts: 0 });
+      }
+    });
+  }
+  // 이미 대기열에 있는 변경이 더 최신이므로 뒤에 둠
+  syncQueue = compactSyncQueue([...seeds, ...syncQueue]);
+  localStorage.setItem(SYNC_QUEUE_KEY, JSON.stringify(syncQueue));
+  localStorage.setItem(SYNC_SEEDED_KEY, '1');
+})();
+
+function syncPut(kind, id, data = true) {
+  enqueueSync({ op: 'put', kind, id: String(id), data, ts: Date.now() });
+}
+
+function syncDelete(kind, id) {
+  enqueueSync({ op: 'delete', kind, id: String(id), ts: Date.now() });
+}
+
+// 복습 결과 (SM-2 grade 0~5: 3 미만이면 처음부터 다시)
+function syncReview(id, grade) {
+  enqueueSync({ op: 'review', id: String(id), grade, ts: Date.now() });
+}
+
+// 다른 기기에서 바뀐 내용이 localStorage에 반영되면 호출됨
+function onSyncChange(listener) {
+  syncListeners.push(listener);
+}
+
+// 같은 항목의 put/delete는 마지막 것만 남김 (review는 모두 보냄)
+function compactSyncQueue(queue) {
+  const latest = new Map();
+  queue.forEach((op, i) => {
+    latest.set(op.op === 'review' ? `review#${i}` : `${op.kind}|${op.id}`, op);
+  });
+  return [...latest.values()];
+}
+
+function enqueueSync(op) {
+  syncQueue = compactSyncQueue([...syncQueue, op]);
+  localStorage.setItem(SYNC_QUEUE_KEY, JSON.stringify(syncQueue));
+  clearTimeout(syncTimer);
+  syncTimer = setTimeout(syncNow, SYNC_DELAY_MS);
+}
+
+async function syncNow(keepalive = false) {
+  clearTimeout(syncTimer);
+  if (syncInFlight) {
+    syncTimer = setTimeout(syncNow, SYNC_DELAY_MS);
+    return;
+  }
+  syncInFlight = true;
+  const ops = syncQueue.slice(0, SYNC_MAX_OPS);
+  try {
+    const response = await fetch(`${SYNC_API_BASE}/api/progress/sync`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ user_id: syncUserId, ops, since: syncCursor }),
+      keepalive,
+    });
+    // 400은 다시 보내도 실패하므로 버림, 그 외 실패는 대기열에 남겨서 다음에 재시도
+    if (!response.ok && response.status !== 400) return;
+
+    // 보내는 동안 새로 쌓인 op는 남김
+    const sent = new Set(ops);
+    syncQueue = syncQueue.filter(op => !sent.has(op));
+    localStorage.setItem(SYNC_QUEUE_KEY, JSON.stringify(syncQueue));
+    if (!response.ok) {
+      console.warn('동기화 요청 거부:', (await response.json()).error);
+      return;
+    }
+
+    const result = await response.json();
+    applySyncChanges(result.changes);
+    syncCursor = result.cursor;
+    localStorage.setItem(SYNC_CURSOR_KEY, String(syncCursor));
+    // more: 서버가 변경을 나눠서 보냄 → 남은 것을 바로 이어서 받음
+    if (result.more) syncTimer = setTimeout(syncNow, 0);
+    else if (syncQueue.length) syncTimer = setTimeout(syncNow, SYNC_DELAY_MS);
+  } catch (e) {
+    // 서버가 없거나 오프라인 - 대기열 유지
+  } finally {
+    syncInFlight = false;
+  }
+}
+
+function applySyncChanges(changes) {
+  // 아직 못 보낸 로컬 변경이 있는 항목은 로컬 값을 유지
+  const pending = new Set(syncQueue.map(op => `${op.kind}|${op.id}`));
+  const changed = changes.filter(c => SYNC_STORAGE[c.kind] && !pending.has(`${c.kind}|${c.id}`));
+  if (!changed.length) return;
+
+  for (const [kind, storage] of Object.entries(SYNC_STORAGE)) {
+    const updates = changed.filter(c => c.kind === kind);
+    if (!updates.length) continue;
+
+    let values = JSON.parse(localStorage.getItem(storage.key) || '[]');
+    updates.forEach(change => {
+      if (storage.list) {
+        values = values.filter(item => item.english !== change.id);
+        if (!change.deleted && change.data) values.push(change.data);
+      } else {
+        const id = storage.numeric ? Number(change.id) : change.id;
+        values = values.filter(value => value !== id);
+        if (!change.deleted) values.push(id);
+      }
+    });
+    localStorage.setItem(storage.key, JSON.stringify(values));
+  }
+  syncListeners.forEach(listener => listener(changed));
+}
+
+// 지금 복습할 틀린 문장 (SM-2 일정) - 서버가 없으면 null
+async function fetchDueReviews(limit = 20) {
+  await syncNow(); // 방금 틀린 문장도 일정에 들어가도록 먼저 보냄
+  try {
+    const params = new URLSearchParams({ user_id: syncUserId, limit });
+    const response = await fetch(`${SYNC_API_BASE}/api/review/due?${params}`);
+    return response.ok ? await response.json() : null;
+  } catch (e) {
+    return null;
+  }
+}
+
+document.addEventListener('DOMContentLoaded', () => syncNow());
+document.addEventListener('visibilitychange', () => {
+  if (document.visibilityState === 'hidden' && syncQueue.length) syncNow(true);
+  else if (document.visibilityState === 'visible') syncNow();
+});
@@ -0,0 +1,214 @@
+"""
+단어 기본형 찾기 (변화형 역색인)
+- 사전의 표제어마다 나올 수 있는 변화형을 미리 만들어 두고
+  변화형 → (표제어, 규칙) 역색인을 한 번만 구축 → 조회는 dict 한 번 (O(1))
+- 규칙: -s/-es/-ies, -ed/-ied, 자음 중복(stopped), e 탈락(making), -ly/-ily,
+  -er/-est, 불규칙 동사/복수
+
+벤치마크 (patterns.json의 전체 주요 단어로 적중률/조회 비용 측정):
+    python lemmatizer.py
+"""
+
+import re
+
+VOWELS = set('aeiou')
+
+# 원형: (과거형, 과거분사)
+IRREGULAR_VERBS = {
+    'be': ('was', 'been'), 'begin': ('began', 'begun'), 'break': ('broke', 'broken'),
+    'bring': ('brought', 'brought'), 'build': ('built', 'built'), 'buy': ('bought', 'bought'),
+    'catch': ('caught', 'caught'), 'choose': ('chose', 'chosen'), 'come': ('came', 'come'),
+    'cost': ('cost', 'cost'), 'cut': ('cut', 'cut'), 'deal': ('dealt', 'dealt'),
+    'do': ('did', 'done'), 'draw': ('drew', 'drawn'), 'dream': ('dreamt', 'dreamt'),
+    'drink': ('drank', 'drunk'), 'drive': ('drove', 'driven'), 'eat': ('ate', 'eaten'),
+    'fall': ('fell', 'fallen'), 'feel': ('felt', 'felt'), 'fight': ('fought', 'fought'),
+    'find': ('found', 'found'), 'fly': ('flew', 'flown'), 'forget': ('forgot', 'forgotten'),
+    'forgive': ('forgave', 'forgiven'), 'get': ('got', 'gotten'), 'give': ('gave', 'given'),
+    'go': ('went', 'gone'), 'grow': ('grew', 'grown'), 'hang': ('hung', 'hung'),
+    'have': ('had', 'had'), 'hear': ('heard', 'heard'), 'hide': ('hid', 'hidden'),
+    'hit': ('hit', 'hit'), 'hold': ('held', 'held'), 'hurt': ('hurt', 'hurt'),
+    'keep': ('kept', 'kept'), 'know': ('knew', 'known'), 'lead': ('led', 'led'),
+    'learn': ('learnt', 'learnt'), 'leave': ('left', 'left'), 'lend': ('lent', 'lent'),
+    'let': ('let', 'let'), 'lie': ('lay', 'lain'), 'lose': ('lost', 'lost'),
+    'make': ('made', 'made'), 'mean': ('meant', 'meant'), 'meet': ('met', 'met'),
+    'pay': ('paid', 'paid'), 'put': ('put', 'put'), 'quit': ('quit', 'quit'),
+    'read': ('read', 'read'), 'ride': ('rode', 'ridden'), 'ring': ('rang', 'rung'),
+    'rise': ('rose', 'risen'), 'run': ('ran', 'run'), 'say': ('said', 'said'),
+    'see': ('saw', 'seen'), 'sell': ('sold', 'sold'), 'send': ('sent', 'sent'),
+    'set': ('set', 'set'), 'shake': ('shook', 'shaken'), 'shut': ('shut', 'shut'),
+    'sing': ('sang', 'sung'), 'sit': ('sat', 'sat'), 'sleep': ('slept', 'slept'),
+    'speak': ('spoke', 'spoken'), 'spend': ('spent', 'spent'), 'split': ('split', 'split'),
+    'stand': ('stood', 'stood'), 'steal': ('stole', 'stolen'), 'swim': ('swam', 'swum'),
+    'take': ('took', 'taken'), 'teach': ('taught', 'taught'), 'tell': ('told', 'told'),
+    'think': ('thought', 'thought'), 'throw': ('threw', 'thrown'), 'understand': ('understood', 'understood'),
+    'wake': ('woke', 'woken'), 'wear': ('wore', 'worn'), 'win': ('won', 'won'),
+    'write': ('wrote', 'written'),
+}
+
+IRREGULAR_PLURALS = {
+    'child': 'children', 'man': 'men', 'woman': 'women', 'person': 'people',
+    'foot': 'feet', 'tooth': 'teeth', 'mouse': 'mice', 'life': 'lives',
+    'knife': 'knives', 'wife': 'wives', 'leaf': 'leaves',
+}
+
+# 불규칙 비교급/최상급
+IRREGULAR_COMPARATIVES = {
+    'good': ('better', 'best'), 'bad': ('worse', 'worst'), 'far': ('farther', 'farthest'),
+}
+
+# 2음절 이상이지만 끝 자음을 겹치는 단어 (끝음절 강세)
+DOUBLE_FINAL = {
+    'admit', 'begin', 'commit', 'control', 'forget', 'occur', 'permit', 'prefer',
+    'refer', 'regret', 'upset',
+}
+
+
+def _syllables(word):
+    return len(re.findall(r'[aeiouy]+', word))
+
+
+def _doubles_final(word):
+    """stop → stopp(ed), plan → plann(ing) 처럼 끝 자음을 겹치는지 (자음-모음-자음)"""
+    if word in DOUBLE_FINAL:
+        return True
+    if len(word) < 3 or _syllables(word) != 1:
+        return False
+    a, b, c = word[-3:]
+    return a not in VOWELS and b in VOWELS and c not in VOWELS and c not in 'wxy'
+
+
+def _consonant_y(word):
+    return len(word) >= 2 and word[-1] == 'y' and word[-2] not in VOWELS
+
+
+def inflections(word):
+    """표제어에서 만들 수 있는 (변화형, 규칙) 목록 - 불규칙형이 앞에 온다"""
+    forms = []
+
+    if word in IRREGULAR_VERBS:
+        past, participle = IRREGULAR_VERBS[word]
+        forms += [(past, 'irregular'), (participle, 'irregular')]
+    if word in IRREGULAR_PLURALS:
+        forms.append((IRREGULAR_PLURALS[word], 'irregular'))
+    if word in IRREGULAR_COMPARATIVES:
+        forms += [(form, 'irregular') for form in IRREGULAR_COMPARATIVES[word]]
+
+    # -s / -es / -ies
+    if _consonant_y(word):
+        forms.append((word[:-1] + 'ies', 'ies'))
+    elif word.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        forms.append((word + 'es', 'es'))
+    else:
+        forms.append((word + 's', 's'))
+
+    # -ed / -ing / -er / -est
+    if _consonant_y(word):
+        forms += [(word[:-1] + 'ied', 'ied'), (word + 'ing', 'ing'),
+                  (word[:-1] + 'ier', 'ier'), (word[:-1] + 'iest', 'iest')]
+    elif word.endswith('ie'):
+        forms += [(word + 'd', 'ed'), (word[:-2] + 'ying', 'ie-ying')]
+    elif word.endswith('e'):
+        forms += [(word + 'd', 'ed'), (word + 'r', 'er'), (word + 'st', 'est')]
+        if not word.endswith(('ee', 'ye', 'oe')):
+            forms.append((word[:-1] + 'ing', 'e-drop'))
+        else:
+            forms.append((word + 'ing', 'ing'))
+    elif _doubles_final(word):
+        doubled = word + word[-1]
+        forms += [(doubled + 'ed', 'double'), (doubled + 'ing', 'double'),
+                  (doubled + 'er', 'double'), (doubled + 'est', 'double')]
+    else:
+        forms += [(word + 'ed', 'ed'), (word + 'ing', 'ing'),
+                  (word + 'er', 'er'), (word + 'est', 'est')]
+
+    # 부사 -ly
+    if _consonant_y(word):
+        forms.append((word[:-1] + 'ily', 'ily'))
+    elif word.endswith('le') and len(word) > 3:
+        forms.append((word[:-1] + 'y', 'ly'))
+    elif word.endswith('ic'):
+        forms.append((word + 'ally', 'ly'))
+    else:
+        forms.append((word + 'ly', 'ly'))
+
+    return forms
+
+
+class InflectionIndex:
+    """변화형 → (표제어, 규칙) 역색인
+
+    사전에 그대로 있는 단어는 항상 'exact'로 우선한다. 같은 변화형이 여러 표제어에서
+    나오면 먼저 만든 쪽(사전 순서, 불규칙형 우선)을 쓴다.
+    """
+
+    def __init__(self, vocab):
+        self.vocab = vocab
+        self._index = {word: (word, 'exact') for word in vocab}
+        for word in vocab:
+            for form, rule in inflections(word):
+                if form not in self._index:
+                    self._index[form] = (word, rule)
+
+    def __len__(self):
+        return len(self._index)
+
+    def lookup(self, word):
+        """(표제어, 규칙) 또는 None"""
+        return self._index.get(word)
+
+    def meaning(self, word):
+        match = self._index.get(word)
+        return self.vocab[match[0]] if match else None
+
+
+def _legacy_lookup(vocab, word):
+    """예전 update_meanings()의 접미사 제거 방식 (비교용)"""
+    if word in vocab:
+        return word
+    if word.endswith('s') and word[:-1] in vocab: return word[:-1]
+    if word.endswith('ed') and word[:-2] in vocab: return word[:-2]
+    if word.endswith('ing') and word[:-3] in vocab: return word[:-3]
+    if word.endswith('ly') and word[:-2] in vocab: return word[:-2]
+    return None
+
+
+def benchmark(data_path=None, repeat=200):
+    import json
+    import time
+    from collections import Counter
+    from update_vocab_meanings import VOCAB_DICT, DEFAULT_DATA_PATH, normalize_word
+
+    with open(data_path or DEFAULT_DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    words = [normalize_word(v['word']) for day in data['days'] for v in day.get('vocabulary', [])]
+
+    start = time.perf_counter()
+    index = InflectionIndex(VOCAB_DICT)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def measure(fn):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for word in words:
+                fn(word)
+        return (time.perf_counter() - start) / (repeat * len(words)) * 1e9
+
+    legacy_ns = measure(lambda w: _legacy_lookup(VOCAB_DICT, w))
+    index_ns = measure(index.lookup)
+
+    legacy_hits = sum(1 for w in words if _legacy_lookup(VOCAB_DICT, w) is not None)
+    matches = [index.lookup(w) for w in words]
+    rules = Counter(m[1] for m in matches if m)
+    index_hits = sum(rules.values())
+    gained = sorted({w for w, m in zip(words, matches) if m and _legacy_lookup(VOCAB_DICT, w) is None})
+
+    print(f"📚 단어 {len(words)}개 / 표제어 {len(VOCAB_DICT)}개 / 색인 {len(index)}개 (구축 {build_ms:.2f}ms)")
+    print(f"   예전 방식: 적중 {legacy_hits}개 ({legacy_hits / len(words):.1%}), 단어당 {legacy_ns:.0f}ns")
+    print(f"   역색인   : 적중 {index_hits}개 ({index_hits / len(words):.1%}), 단어당 {index_ns:.0f}ns")
+    print(f"   규칙별: {dict(rules.most_common())}")
+    if gained:
+        print(f"   새로 찾은 단어: {', '.join(gained[:20])}{' ...' if len(gained) > 20 else ''}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,165 @@
+"""
+패턴 예문 / 주요 단어 오디오 사전 렌더링
+- data/patterns.json의 모든 examples[].english, vocabulary[].word를 병렬로 합성
+- docs/audio/<해시>.wav + docs/audio/manifest.json 생성 → GitHub Pages에서 정적 제공
+- 증분 실행: manifest에 이미 있는 해시는 건너뛰고, 더 이상 안 쓰는 파일은 삭제
+
+사용법:
+    python prerender_audio.py                     # Gemini TTS (Vertex AI)
+    python prerender_audio.py --backend stub      # 네트워크 없이 무음 WAV (테스트용)
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR / 'server'))
+
+from tts import audio_key, resolve_voice, wav_duration, pcm_to_wav, GeminiSynthesizer
+from update_vocab_meanings import write_atomic
+
+PROJECT_ID = "affable-grin-482008-e4"
+LOCATION = "us-central1"
+
+# 언어별 렌더링 설정 - manifest에 같이 저장되어 프런트엔드가 같은 키를 계산함
+RENDER_SETTINGS = {
+    'en': {'voice': resolve_voice('en'), 'speed': 0.85},
+}
+
+
+class StubSynthesizer:
+    """네트워크 없이 글자 수에 비례한 길이의 무음 WAV를 만드는 가짜 합성기"""
+
+    def synthesize(self, text, voice, lang, speed):
+        seconds = max(0.3, len(text) * 0.06 / speed)
+        return pcm_to_wav(b'\x00\x00' * int(24000 * seconds))
+
+
+def make_gemini_synthesizer():
+    from google import genai
+
+    client = genai.Client(vertexai=True, project=PROJECT_ID, location=LOCATION)
+    return GeminiSynthesizer(client)
+
+
+BACKENDS = {
+    'gemini': make_gemini_synthesizer,
+    'stub': StubSynthesizer,
+}
+
+
+def collect_texts(data):
+    """렌더링할 (lang, text) 목록 - 중복 제거, 순서 유지"""
+    texts = []
+    for day in data['days']:
+        for pattern in day.get('patterns', []):
+            for example in pattern.get('examples', []):
+                texts.append(('en', example['english']))
+        for vocab in day.get('vocabulary', []):
+            texts.append(('en', vocab['word']))
+    return list(dict.fromkeys(texts))
+
+
+def synthesize_with_retry(synthesizer, text, lang, settings, retries, base_delay):
+    """실패 시 지수 백오프(+지터)로 재시도"""
+    for attempt in range(retries + 1):
+        try:
+            return synthesizer.synthesize(text, settings['voice'], lang, settings['speed'])
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(base_delay * (2 ** attempt) * (0.5 + random.random()))
+
+
+def prerender(data_path, out_dir, synthesizer, workers=4, retries=4, base_delay=1.0):
+    with open(data_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / 'manifest.json'
+    old_items = {}
+    if manifest_path.exists():
+        old_manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        if old_manifest.get('settings') == RENDER_SETTINGS:
+            old_items = old_manifest.get('items', {})
+
+    # 키 계산 → 이미 있는 것은 재사용, 나머지만 합성
+    items = {}
+    jobs = []
+    for lang, text in collect_texts(data):
+        key = audio_key(text, RENDER_SETTINGS[lang]['voice'], lang, RENDER_SETTINGS[lang]['speed'])
+        old = old_items.get(key)
+        if old and (out_dir / old['file']).exists():
+            items[key] = old
+        elif key not in items:
+            items[key] = None
+            jobs.append((key, lang, text))
+
+    print(f"🎧 전체 {len(items)}개 중 {len(jobs)}개 새로 렌더링 (워커 {workers}개)")
+
+    failed = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(synthesize_with_retry, synthesizer, text, lang,
+                                RENDER_SETTINGS[lang], retries, base_delay): (key, lang, text)
+                for key, lang, text in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                key, lang, text = futures[future]
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    failed.append(text)
+                    print(f"❌ [{done}/{len(jobs)}] {text}: {e}")
+                    continue
+                file_name = f"{key}.wav"
+                write_atomic(out_dir / file_name, audio)
+                items[key] = {
+                    'file': file_name,
+                    'lang': lang,
+                    'text': text,
+                    'duration': round(wav_duration(audio), 3)
+                }
+                print(f"✅ [{done}/{len(jobs)}] {text}")
+    finally:
+        # 중간에 멈춰도 끝난 것까지는 manifest에 남겨서 다음 실행에서 재사용
+        items = {key: item for key, item in items.items() if item}
+        manifest = {'settings': RENDER_SETTINGS, 'items': dict(sorted(items.items()))}
+        write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    # 더 이상 쓰지 않는 오디오 파일 삭제
+    used_files = {item['file'] for item in items.values()}
+    removed = 0
+    for path in out_dir.glob('*.wav'):
+        if path.name not in used_files:
+            path.unlink()
+            removed += 1
+
+    print(f"📦 manifest: {manifest_path} ({len(items)}개, 삭제 {removed}개)")
+    if failed:
+        print(f"⚠️ 실패 {len(failed)}개 - 다시 실행하면 실패한 것만 재시도합니다")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='패턴/단어 오디오 사전 렌더링')
+    parser.add_argument('--data', type=Path, default=ROOT_DIR / 'data' / 'patterns.json')
+    parser.add_argument('--out', type=Path, default=ROOT_DIR / 'docs' / 'audio')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='gemini')
+    parser.add_argument('--workers', type=int, default=4, help='동시 합성 요청 수')
+    parser.add_argument('--retries', type=int, default=4)
+    args = parser.parse_args()
+
+    synthesizer = BACKENDS[args.backend]()
+    ok = prerender(args.data, args.out, synthesizer, workers=args.workers, retries=args.retries)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+입장 제어 (admission control)
+- POST 본문 크기 제한 → 413
+- 클라이언트(IP 또는 세션)별 토큰 버킷 → 429 + Retry-After
+- Gemini 동시 호출 수 제한 + 마감 시간이 있는 FIFO 대기열 → 자리가 없으면 바로 503 + Retry-After
+느린 호출이 몰려도 대기 시간이 끝없이 늘지 않고, 나머지 학생 요청의 지연(p99)을 예측 가능하게 유지
+"""
+
+import math
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class AdmissionError(Exception):
+    """입장 거절 - status(413/429/503)와 Retry-After(초, 없으면 None)로 응답"""
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    def headers(self):
+        if self.retry_after is None:
+            return {}
+        return {'Retry-After': str(max(1, math.ceil(self.retry_after)))}
+
+
+class RateLimiter:
+    """클라이언트별 토큰 버킷 (스레드 안전)
+
+    초당 rate개씩 채워지고 최대 burst개까지 모아둘 수 있다. rate <= 0이면 끔.
+    버킷은 최근 사용 순으로 max_clients개까지만 보관 (오래된 것부터 삭제).
+    """
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # key -> [남은 토큰, 마지막 갱신 시각]
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def take(self, key, cost=1.0, now=None):
+        """허용되면 0, 아니면 다시 시도할 수 있을 때까지 남은 초"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                self.allowed += 1
+                return 0.0
+            self.limited += 1
+            return (cost - bucket[0]) / self.rate
+
+    def stats(self):
+        with self._lock:
+            return {'clients': len(self._buckets), 'allowed': self.allowed, 'limited': self.limited}
+
+
+class ConcurrencyGate:
+    """동시 실행 limit개 + FIFO 대기열 queue_size개 (스레드 안전)
+
+    대기열이 가득 차면 기다리지 않고 바로, 대기 중 wait초(마감)가 지나면 AdmissionError(503).
+    자리가 나면 먼저 온 대기자에게 바로 넘긴다. limit <= 0이면 끔.
+    """
+
+    def __init__(self, limit, queue_size, wait):
+        self.limit = limit
+        self.queue_size = max(queue_size, 0)
+        self.wait = wait
+        self._lock = threading.Lock()
+        self._waiters = deque()  # 자리를 넘겨받으면 set되는 Event
+        self.active = 0
+        self.admitted = 0
+        self.queued = 0
+        self.queue_full = 0
+        self.timeouts = 0
+
+    def _busy(self):
+        return AdmissionError(503, 'Server busy', retry_after=self.wait or 1)
+
+    def acquire(self):
+        if self.limit <= 0:
+            return
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                self.admitted += 1
+                return
+            if len(self._waiters) >= self.queue_size:
+                self.queue_full += 1
+                raise self._busy()
+            ready = threading.Event()
+            self._waiters.append(ready)
+            self.queued += 1
+
+        ready.wait(self.wait)
+        with self._lock:
+            # set은 락 안에서만 하므로 시간 초과와 자리 넘겨받기가 겹쳐도 여기서 한 번에 판단
+            if ready.is_set():
+                self.admitted += 1
+                return
+            self._waiters.remove(ready)
+            self.timeouts += 1
+        raise self._busy()
+
+    def resize(self, limit, queue_size):
+        """자리 수/대기열 크기 변경 (서버 시작 시 실제 워커 수에 맞춤) - 늘어난 자리는 대기자에게 바로 넘김"""
+        with self._lock:
+            self.limit = limit
+            self.queue_size = max(queue_size, 0)
+            while self._waiters and self.active < self.limit:
+                self.active += 1
+                self._waiters.popleft().set()
+
+    def release(self):
+        if self.limit <= 0:
+            return
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()  # active 수는 그대로 - 자리를 바로 넘김
+            else:
+                self.active -= 1
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': self.active,
+                'waiting': len(self._waiters),
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'queue_full': self.queue_full,
+                'queue_timeouts': self.timeouts,
+            }
+
+
+class Admission:
+    """본문 크기 / 클라이언트별 요청 빈도 / Gemini 동시 호출 제한을 한곳에서 관리"""
+
+    def __init__(self, rate, burst, concurrency, queue_size, queue_wait, max_clients=10000):
+        self.limiter = RateLimiter(rate, burst, max_clients)
+        self.gate = ConcurrencyGate(concurrency, queue_size, queue_wait)
+        self._lock = threading.Lock()
+        self.body_too_large = 0
+        self.overloaded = 0
+
+    def check_body(self, length, limit):
+        if length > limit:
+            with self._lock:
+                self.body_too_large += 1
+            raise AdmissionError(413, f'Request body too large (max {limit} bytes)')
+
+    def check_rate(self, key):
+        wait = self.limiter.take(key)
+        if wait:
+            raise AdmissionError(429, 'Too many requests', retry_after=wait)
+
+    def upstream(self):
+        """Gemini 호출 구간 - with admission.upstream(): ..."""
+        return self.gate.slot()
+
+    def shed(self):
+        """워커와 대기열이 모두 차서 연결을 바로 돌려보냄 (PooledHTTPServer)"""
+        with self._lock:
+            self.overloaded += 1
+
+    def stats(self):
+        limiter = self.limiter.stats()
+        with self._lock:
+            own = {'body_too_large': self.body_too_large, 'overloaded': self.overloaded}
+        return {
+            **self.gate.stats(),
+            'rate_clients': limiter['clients'],
+            'rate_limited': limiter['limited'],
+            **own,
+        }
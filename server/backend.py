@@ -5,17 +5,103 @@ Kongdan 백엔드 서버
 """
 
 import os
+import sys
 import json
+import math
+import time
+import signal
+import argparse
+import threading
 from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+# 저장소 루트의 공용 모듈(update_vocab_meanings, lemmatizer) 사용
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from reply_cache import ReplyCache, make_cache_key
+from chat_sessions import SessionStore
+from tts import AudioCache, GeminiSynthesizer, audio_key, resolve_voice, VOICE_PATTERN
+from search_index import SearchIndex
+from metrics import Registry
+from singleflight import SingleFlight
+from compression import negotiate, compress, is_compressible
+from static_files import StaticFiles
+from progress_store import ProgressStore, ProgressError
+from grader import Grader, SCORERS, DEFAULT_THRESHOLD as GRADE_THRESHOLD
+from prompt_context import PromptContextCache, GeminiContextProvider, StubContextProvider
+from admission import Admission, AdmissionError
+from keepalive import IdleConnections
+
 # ===== 설정 =====
 PORT = 3001
+DATA_PATH = ROOT_DIR / 'data' / 'patterns.json'
 PROJECT_ID = "affable-grin-482008-e4"
 LOCATION = "us-central1"
 
+# 동시 처리 설정 (환경변수로 덮어쓰기 가능)
+MAX_WORKERS = int(os.environ.get('KONGDAN_WORKERS', 64))        # 동시에 처리할 요청 수 (대부분 Gemini를 기다리는 스레드라 넉넉하게)
+MAX_QUEUE = int(os.environ.get('KONGDAN_QUEUE', 64))            # 워커를 기다릴 수 있는 연결 수
+REQUEST_TIMEOUT = float(os.environ.get('KONGDAN_REQUEST_TIMEOUT', 30))  # 소켓 읽기/쓰기 제한 (초)
+GEMINI_TIMEOUT = float(os.environ.get('KONGDAN_GEMINI_TIMEOUT', 25))    # Gemini 호출 제한 (초)
+ACCEPT_WAIT = float(os.environ.get('KONGDAN_ACCEPT_WAIT', 1))           # 워커+대기열이 가득 찼을 때 새 연결을 기다리게 하는 시간, 넘으면 503
+
+# 입장 제어 - 한 클라이언트나 순간적인 폭주가 워커를 다 차지하지 않도록
+MAX_BODY_BYTES = int(os.environ.get('KONGDAN_MAX_BODY', 64 * 1024))      # POST 본문 최대 크기 (넘으면 413)
+RATE_LIMIT = float(os.environ.get('KONGDAN_RATE_LIMIT', 2))              # 클라이언트별 초당 챗봇/TTS 요청 수, 0이면 끔
+RATE_BURST = int(os.environ.get('KONGDAN_RATE_BURST', 20))               # 한 번에 몰아 보낼 수 있는 요청 수
+RATE_LIMIT_KEY = os.environ.get('KONGDAN_RATE_LIMIT_KEY', 'ip')          # ip | session (교실처럼 IP 하나를 같이 쓰면 session)
+TRUST_PROXY = os.environ.get('KONGDAN_TRUST_PROXY', '') == '1'          # 프록시 뒤라면 X-Forwarded-For 마지막 주소를 클라이언트 IP로
+UPSTREAM_CONCURRENCY = os.environ.get('KONGDAN_UPSTREAM_CONCURRENCY', '')  # Gemini 동시 호출 수 (비우면 워커 수 / 4), 0이면 끔
+UPSTREAM_QUEUE = os.environ.get('KONGDAN_UPSTREAM_QUEUE', '')              # 자리를 기다릴 수 있는 요청 수 (비우면 워커 수 / 2)
+UPSTREAM_QUEUE_WAIT = float(os.environ.get('KONGDAN_UPSTREAM_QUEUE_WAIT', 10))  # 대기 마감 (초), 넘으면 503
+# 여러 항목을 한 번에 보내는 경로는 본문 제한을 따로 (동기화 op 500개 x 4KB, 채점 200문항 x 후보 5개)
+BODY_LIMITS = {'/api/progress/sync': 4 * 1024 * 1024, '/api/grade': 1024 * 1024}
+RATE_LIMITED_ROUTES = {'/api/chat', '/api/chat/stream', '/api/tts'}
+
+# 응답 캐시 설정 (DB 경로를 비워두면 메모리 캐시만 사용)
+REPLY_CACHE_SIZE = int(os.environ.get('KONGDAN_REPLY_CACHE_SIZE', 1000))
+REPLY_CACHE_TTL = float(os.environ.get('KONGDAN_REPLY_CACHE_TTL', 24 * 3600))  # 초
+REPLY_CACHE_DB = os.environ.get('KONGDAN_REPLY_CACHE_DB', '')
+
+# 서버 측 대화 세션 설정
+SESSION_TOKEN_BUDGET = int(os.environ.get('KONGDAN_SESSION_TOKENS', 1500))  # 세션당 보관할 대화 기록 토큰 예산
+SESSION_TTL = float(os.environ.get('KONGDAN_SESSION_TTL', 3600))            # 이 시간(초) 동안 안 쓰면 삭제
+SESSION_MAX = int(os.environ.get('KONGDAN_SESSION_MAX', 1000))              # 최대 세션 수 (초과 시 LRU 삭제)
+SESSION_SUMMARY = os.environ.get('KONGDAN_SESSION_SUMMARY', '') == '1'     # 잘린 예전 대화를 Gemini로 요약
+
+# 동일 요청 합치기 - 같은 질문이 동시에 몰리면 Gemini 호출 하나를 나눠 씀
+COALESCE_WAIT = float(os.environ.get('KONGDAN_COALESCE_WAIT', 30))  # 먼저 온 요청을 기다리는 최대 시간(초), 0이면 끔
+
+# HTTP 연결/압축/정적 파일 설정
+KEEPALIVE_TIMEOUT = float(os.environ.get('KONGDAN_KEEPALIVE_TIMEOUT', 5))  # 다음 요청을 기다리는 시간(초) - 워커 밖(selector)에서 기다림
+KEEPALIVE_MAX = int(os.environ.get('KONGDAN_KEEPALIVE_MAX', 256))           # 보관할 유휴 연결 수 (넘으면 오래된 것부터 닫음)
+COMPRESS_MIN_BYTES = int(os.environ.get('KONGDAN_COMPRESS_MIN', 1024))     # 이보다 큰 응답만 gzip/brotli 압축
+STATIC_DIR = os.environ.get('KONGDAN_STATIC_DIR', '')                     # 지정하면 이 폴더(docs/)를 정적 파일로 제공
+
+# 프롬프트 컨텍스트 캐시 - 시스템 프롬프트 + 전체 커리큘럼을 캐시 콘텐츠로 등록해 참조만 보내고 Day는 안내문으로 알려줌
+PROMPT_CACHE = os.environ.get('KONGDAN_PROMPT_CACHE', 'gemini')            # gemini | stub | off
+PROMPT_CACHE_TTL = float(os.environ.get('KONGDAN_PROMPT_CACHE_TTL', 3600))  # 초
+PROMPT_CACHE_MIN_TOKENS = int(os.environ.get('KONGDAN_PROMPT_CACHE_MIN_TOKENS', 4096))  # 모델의 캐시 최소 토큰 수 - 작으면 등록 안 함
+
+# 학습 진행 상황 동기화 (SQLite WAL)
+PROGRESS_DB = os.environ.get('KONGDAN_PROGRESS_DB', str(Path(__file__).parent / 'progress.db'))
+
+# TTS 오디오 캐시 설정
+TTS_CACHE_DIR = os.environ.get('KONGDAN_TTS_CACHE_DIR', str(Path(__file__).parent / '.tts_cache'))
+TTS_MEMORY_MB = int(os.environ.get('KONGDAN_TTS_MEMORY_MB', 32))  # 메모리에 올려둘 오디오 용량
+TTS_DISK_MB = int(os.environ.get('KONGDAN_TTS_DISK_MB', 512))      # 디스크 캐시 용량 - 넘으면 오래 안 쓴 파일부터 삭제
+TTS_MAX_CHARS = 500
+
+# 답안 채점 (POST /api/grade)
+GRADE_MAX_ITEMS = 200         # 한 요청 문항 수 (Day 하나 = 40문항)
+GRADE_MAX_ALTERNATIVES = 5    # 문항당 음성 인식 후보 수
+GRADE_MAX_CHARS = 300
+
 # 서비스 계정 키 파일 설정
-CREDENTIALS_FILE = Path(__file__).parent.parent / "affable-grin-482008-e4-f817e80887ef.json"
+CREDENTIALS_FILE = ROOT_DIR / "affable-grin-482008-e4-f817e80887ef.json"
 if CREDENTIALS_FILE.exists():
     os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = str(CREDENTIALS_FILE)
     print(f"🔑 인증 파일 로드: {CREDENTIALS_FILE.name}")
@@ -28,7 +114,8 @@ try:
     client = genai.Client(
         vertexai=True,
         project=PROJECT_ID,
-        location=LOCATION
+        location=LOCATION,
+        http_options=types.HttpOptions(timeout=int(GEMINI_TIMEOUT * 1000))
     )
     print("✅ Vertex AI 연결 완료")
 except ImportError:
@@ -53,99 +140,999 @@ A: would는 "~할 텐데", could는 "~할 수 있을 텐데". would가 더 확
 
 절대 길게 설명하지 마. 친구한테 카톡하듯이 짧게!"""
 
+CHAT_MODEL = "gemini-2.0-flash"  # 최신 모델
+
+# ===== 메트릭 (GET /api/metrics, Prometheus 텍스트 형식) =====
+KNOWN_ROUTES = {'/api/health', '/api/metrics', '/api/chat', '/api/chat/stream', '/api/tts', '/api/search',
+                '/api/progress/sync', '/api/review/due', '/api/grade'}
+
+metrics = Registry()
+http_requests = metrics.counter('kongdan_http_requests_total', 'HTTP 요청 수', ('route', 'method', 'status'))
+http_latency = metrics.histogram('kongdan_http_request_seconds', 'HTTP 요청 처리 시간', ('route',))
+http_in_flight = metrics.gauge('kongdan_http_in_flight', '처리 중인 HTTP 요청 수', ('route',))
+errors_total = metrics.counter('kongdan_errors_total', '오류 수 (예외 종류별)', ('where', 'type'))
+chat_phase = metrics.histogram('kongdan_chat_phase_seconds', '챗봇 요청 단계별 시간', ('phase',))
+gemini_latency = metrics.histogram('kongdan_gemini_request_seconds', 'Gemini 호출 시간', ('call',))
+gemini_first_chunk = metrics.histogram('kongdan_gemini_first_chunk_seconds', 'Gemini 스트리밍 첫 청크까지 시간', ('call',))
+gemini_tokens = metrics.counter('kongdan_gemini_tokens_total', 'Gemini 토큰 사용량 (usage_metadata)', ('call', 'kind'))
+
+
+def record_usage(call, usage):
+    if usage is None:
+        return
+    for kind, attr in (('prompt', 'prompt_token_count'), ('output', 'candidates_token_count'),
+                       ('cached', 'cached_content_token_count'), ('total', 'total_token_count')):
+        count = getattr(usage, attr, None)
+        if count:
+            gemini_tokens.inc(count, call=call, kind=kind)
+
+
+def gemini_generate(call, **kwargs):
+    """client.models.generate_content + 지연/토큰/오류 메트릭"""
+    started = time.perf_counter()
+    try:
+        response = client.models.generate_content(**kwargs)
+    except Exception as e:
+        errors_total.inc(where=f'gemini_{call}', type=type(e).__name__)
+        raise
+    finally:
+        gemini_latency.observe(time.perf_counter() - started, call=call)
+    record_usage(call, response.usage_metadata)
+    return response
+
+
+def gemini_stream(call, **kwargs):
+    """client.models.generate_content_stream + 첫 청크/전체 지연, 토큰, 오류 메트릭"""
+    started = time.perf_counter()
+    usage = None
+    first = True
+    try:
+        for chunk in client.models.generate_content_stream(**kwargs):
+            if first:
+                gemini_first_chunk.observe(time.perf_counter() - started, call=call)
+                first = False
+            if chunk.usage_metadata:
+                usage = chunk.usage_metadata
+            yield chunk
+    except GeneratorExit:
+        raise
+    except Exception as e:
+        errors_total.inc(where=f'gemini_{call}', type=type(e).__name__)
+        raise
+    finally:
+        gemini_latency.observe(time.perf_counter() - started, call=call)
+        record_usage(call, usage)
+
+# 자주 반복되는 질문은 Gemini를 다시 부르지 않고 캐시에서 응답
+reply_cache = ReplyCache(REPLY_CACHE_SIZE, REPLY_CACHE_TTL, REPLY_CACHE_DB or None)
+
+
+def make_prompt_provider():
+    if PROMPT_CACHE == 'stub':
+        return StubContextProvider()
+    if PROMPT_CACHE == 'gemini' and client:
+        return GeminiContextProvider(client, CHAT_MODEL, types, PROMPT_CACHE_MIN_TOKENS)
+    return None
+
+
+prompt_contexts = PromptContextCache(DATA_PATH, CHATBOT_SYSTEM_PROMPT, make_prompt_provider(), PROMPT_CACHE_TTL)
+chat_flight = SingleFlight(COALESCE_WAIT)
+
+
+def summarize_turns(summary, dropped_turns):
+    """토큰 예산을 넘어 잘린 대화를 기존 요약과 합쳐 짧게 요약"""
+    transcript = '\n'.join(
+        f"{'학생' if t['role'] == 'user' else '콩쌤'}: {t['text']}" for t in dropped_turns
+    )
+    prompt = (
+        "아래는 영어 과외 챗봇 대화야. 학생이 뭘 물어봤고 뭘 배웠는지 2문장 이내로 요약해.\n"
+        f"기존 요약: {summary or '없음'}\n\n{transcript}"
+    )
+    # 채팅과 같은 Gemini 동시 호출 제한 - 자리가 없으면 AdmissionError로 이번 요약은 건너뜀
+    with admission.upstream():
+        response = gemini_generate(
+            'summary',
+            model=CHAT_MODEL,
+            contents=prompt,
+            config=types.GenerateContentConfig(max_output_tokens=150, temperature=0.2)
+        )
+    return (response.text or summary).strip()
+
+
+session_store = SessionStore(
+    max_sessions=SESSION_MAX,
+    ttl=SESSION_TTL,
+    token_budget=SESSION_TOKEN_BUDGET,
+    summarizer=summarize_turns if SESSION_SUMMARY else None
+)
+
+# 패턴 문장은 고정된 세트라 대부분 캐시에서 바로 나감
+audio_cache = AudioCache(TTS_CACHE_DIR, TTS_MEMORY_MB * 1024 * 1024, TTS_DISK_MB * 1024 * 1024)
+tts_synthesizer = GeminiSynthesizer(client) if client else None
+
+# 커리큘럼 검색 색인 (patterns.json이 바뀌면 자동으로 다시 색인)
+search_index = SearchIndex(DATA_PATH)
+progress_store = ProgressStore(PROGRESS_DB)
+grader = Grader(DATA_PATH)
+static_files = None  # run_server(static_dir=...)에서 설정
+
+
+def upstream_limits(workers):
+    """(Gemini 동시 호출 수, 대기열 크기) - 환경변수가 없으면 실제 워커 수에서 계산
+
+    대기 중인 요청도 워커 스레드를 하나씩 차지하므로 둘을 합쳐 워커의 3/4까지만 쓰고,
+    나머지 1/4은 health/검색/캐시 적중 같은 가벼운 요청용으로 남긴다.
+    """
+    concurrency = int(UPSTREAM_CONCURRENCY) if UPSTREAM_CONCURRENCY else max(1, workers // 4)
+    queue_size = int(UPSTREAM_QUEUE) if UPSTREAM_QUEUE else workers // 2
+    return concurrency, queue_size
+
+
+admission = Admission(RATE_LIMIT, RATE_BURST, *upstream_limits(MAX_WORKERS), UPSTREAM_QUEUE_WAIT)
+
+metrics.add_collector('kongdan_reply_cache', '챗봇 응답 캐시', reply_cache.stats)
+metrics.add_collector('kongdan_coalesce', '동일 요청 합치기', chat_flight.stats)
+metrics.add_collector('kongdan_sessions', '챗봇 세션', session_store.stats)
+metrics.add_collector('kongdan_tts_cache', 'TTS 오디오 캐시', audio_cache.stats)
+metrics.add_collector('kongdan_search_index', '검색 색인', search_index.stats)
+metrics.add_collector('kongdan_progress', '진행 상황 동기화', progress_store.stats)
+metrics.add_collector('kongdan_grader', '답안 채점', grader.stats)
+metrics.add_collector('kongdan_prompt_cache', '프롬프트 컨텍스트 캐시', prompt_contexts.stats)
+metrics.add_collector('kongdan_admission', '입장 제어', admission.stats)
+
+
+def build_chat_contents(message, history, note=None):
+    """대화 기록 + 현재 메시지를 Gemini contents 형식으로 변환 (note: 현재 메시지 앞에 붙일 Day 안내문)"""
+    contents = []
+    for h in history:
+        role = 'user' if h.get('role') == 'user' else 'model'
+        contents.append(types.Content(role=role, parts=[types.Part(text=h.get('text', ''))]))
+    
+    # 현재 메시지 추가
+    parts = [types.Part(text=note)] if note else []
+    contents.append(types.Content(role='user', parts=parts + [types.Part(text=message)]))
+    return contents
+
+
+def build_chat_config(context):
+    """context: prompt_contexts.context()의 kwargs (cached_content 또는 system_instruction)"""
+    return types.GenerateContentConfig(
+        **context,
+        max_output_tokens=500,
+        temperature=0.7
+    )
+
+
+def is_missing_cache_error(error):
+    """참조한 캐시 콘텐츠가 제공자 쪽에서 만료/삭제됐을 때의 오류인지"""
+    text = str(error)
+    return 'NOT_FOUND' in text or '404' in text
+
+
+def generate_with_context(day, call):
+    """call(config, note) 실행 - 캐시 콘텐츠가 사라졌으면 다음 요청에서 다시 등록하고 이번엔 기본 프롬프트로 재시도"""
+    context, note = prompt_contexts.context(day)
+    try:
+        return call(build_chat_config(context), note)
+    except Exception as e:
+        if 'cached_content' not in context or not is_missing_cache_error(e):
+            raise
+        print(f"⚠️ 프롬프트 캐시 없음 (Day {day}) - 기본 프롬프트로 재시도: {e}")
+        prompt_contexts.invalidate()
+        return call(build_chat_config(prompt_contexts.fallback()), None)
+
+
+def usage_to_dict(usage):
+    """usage_metadata → JSON 직렬화 가능한 dict"""
+    if usage is None:
+        return None
+    return {
+        'prompt_tokens': usage.prompt_token_count,
+        'output_tokens': usage.candidates_token_count,
+        'total_tokens': usage.total_token_count
+    }
+
+
+OVERLOADED_BODY = b'{"error": "Server overloaded"}'
+OVERLOADED_RESPONSE = (
+    b'HTTP/1.1 503 Service Unavailable\r\n'
+    b'Content-Type: application/json\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Expose-Headers: Retry-After\r\n'
+    b'Retry-After: 1\r\n'
+    b'Connection: close\r\n'
+    b'Content-Length: ' + str(len(OVERLOADED_BODY)).encode() + b'\r\n\r\n' + OVERLOADED_BODY
+)
+
+
+class PooledHTTPServer(HTTPServer):
+    """스레드 풀 기반 HTTP 서버
+
+    요청마다 워커 스레드에서 처리하므로 Gemini 응답을 기다리는 동안에도
+    다른 요청(/api/health 등)이 막히지 않는다. 워커 + 대기열이 가득 차면
+    accept 루프가 ACCEPT_WAIT초까지 슬롯을 기다리고 (backpressure),
+    그래도 안 나면 그 연결은 바로 503으로 돌려보낸다 (load shedding).
+    응답을 마친 keep-alive 연결은 워커와 슬롯을 돌려주고 self.idle에서
+    다음 요청을 기다린다.
+    """
+
+    def __init__(self, server_address, handler_class, workers=MAX_WORKERS, queue_size=MAX_QUEUE):
+        # listen() backlog 기본값(5)이면 순간적으로 몰린 연결이 SYN 재전송(1초)을 기다리게 됨
+        self.request_queue_size = workers + queue_size
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kongdan-worker')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.idle = IdleConnections(self.resume_request, self.shutdown_request, KEEPALIVE_TIMEOUT, KEEPALIVE_MAX)
+        self._keep = set()  # 응답 후 idle로 넘길 연결
+        self._keep_lock = threading.Lock()
+        self._closing = False
+
+    def process_request(self, request, client_address):
+        self._dispatch(request, client_address, blocking=True)
+
+    def resume_request(self, request, client_address):
+        """유휴 연결에 다음 요청이 도착 (selector 스레드) - 다른 유휴 연결을 막지 않도록 슬롯을 기다리지 않음"""
+        self._dispatch(request, client_address, blocking=False)
+
+    def _dispatch(self, request, client_address, blocking):
+        acquired = self.slots.acquire(timeout=ACCEPT_WAIT) if blocking else self.slots.acquire(blocking=False)
+        if not acquired:
+            self.shed_request(request)
+            return
+        try:
+            self.executor.submit(self._process_in_worker, request, client_address)
+        except RuntimeError:
+            # 종료 중이라 더 이상 작업을 받을 수 없음
+            self.slots.release()
+            self.shutdown_request(request)
+
+    def _process_in_worker(self, request, client_address):
+        if self._closing:
+            # 종료 중 - 대기열에 있던 요청은 처리하지 않고 연결과 슬롯만 정리
+            self.slots.release()
+            self.shutdown_request(request)
+            return
+        finished = False
+        try:
+            self.finish_request(request, client_address)
+            finished = True
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._keep_lock:
+                keep = request in self._keep
+                self._keep.discard(request)
+            self.slots.release()
+            if keep and finished:
+                self.idle.park(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def keep_alive(self, request):
+        """핸들러가 끝난 뒤 연결을 닫지 않고 유휴 연결로 보관 (RequestHandler.handle)"""
+        with self._keep_lock:
+            self._keep.add(request)
+
+    def shed_request(self, request):
+        """요청을 읽지 않고 고정된 503 응답만 보내고 닫음 - accept 루프를 오래 막지 않도록 논블로킹"""
+        admission.shed()
+        try:
+            request.setblocking(False)
+            try:
+                request.recv(65536)  # 이미 도착한 요청은 읽어둬야 close 때 RST로 응답이 사라지지 않음
+            except BlockingIOError:
+                pass
+            request.send(OVERLOADED_RESPONSE)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._closing = True
+        self.idle.close()
+        # 처리 중인 요청은 끝까지 마치고, 아직 시작 안 한 요청은 _process_in_worker에서 바로 닫음
+        # (cancel_futures로 취소하면 그 연결과 슬롯이 정리되지 않음)
+        self.executor.shutdown(wait=True)
+
 
 class RequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keep-alive - 모든 응답에 Content-Length가 있어야 함 (SSE는 Connection: close)
+    protocol_version = 'HTTP/1.1'
+    timeout = REQUEST_TIMEOUT
+    
+    def handle(self):
+        """요청을 처리하고, keep-alive 연결은 워커를 붙잡지 않고 server.idle로 넘김"""
+        self.close_connection = True
+        self.handle_one_request()
+        # 이미 도착해 버퍼에 있는 다음 요청(파이프라이닝)은 이어서 처리 - 버퍼가 비어야 넘길 수 있음
+        while not self.close_connection and self.request_pending():
+            self.handle_one_request()
+        if not self.close_connection:
+            self.server.keep_alive(self.request)
+    
+    def request_pending(self):
+        """기다리지 않고 읽을 수 있는 다음 요청 바이트가 있는지"""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
     
     def do_OPTIONS(self):
-        self.send_cors_headers()
         self.send_response(204)
+        self.send_cors_headers()
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def do_GET(self):
-        if self.path == '/api/health':
-            self.send_json({'status': 'ok', 'gemini': client is not None})
+        self.instrumented('GET', self.route_get)
+    
+    def do_HEAD(self):
+        self.instrumented('HEAD', self.route_get)
+    
+    def do_POST(self):
+        self.instrumented('POST', self.route_post)
+    
+    def instrumented(self, method, handler):
+        """요청 수/처리 시간/진행 중 요청/처리되지 않은 예외를 경로별로 기록"""
+        route = urlsplit(self.path).path
+        if route not in KNOWN_ROUTES:
+            # 라벨 폭증 방지
+            route = 'static' if static_files and not route.startswith('/api/') else 'other'
+        self.status_code = None
+        started = time.perf_counter()
+        try:
+            with http_in_flight.track(route=route):
+                handler()
+        except Exception as e:
+            errors_total.inc(where='handler', type=type(e).__name__)
+            raise
+        finally:
+            http_requests.inc(route=route, method=method, status=self.status_code or 'none')
+            http_latency.observe(time.perf_counter() - started, route=route)
+    
+    def send_response(self, code, message=None):
+        self.status_code = code
+        super().send_response(code, message)
+    
+    def route_get(self):
+        url = urlsplit(self.path)
+        if url.path == '/api/health':
+            self.send_json({
+                'status': 'ok',
+                'gemini': client is not None,
+                'reply_cache': reply_cache.stats(),
+                'coalesce': chat_flight.stats(),
+                'sessions': session_store.stats(),
+                'tts_cache': audio_cache.stats(),
+                'progress': progress_store.stats(),
+                'prompt_cache': prompt_contexts.stats(),
+                'admission': admission.stats(),
+                'keepalive': self.server.idle.stats()
+            })
+        elif url.path == '/api/tts':
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            # HEAD는 캐시만 확인하고 합성하지 않으므로 요청 빈도 제한도 받지 않음
+            if self.command == 'HEAD' or self.admit(url.path, params):
+                self.handle_tts(params)
+        elif url.path == '/api/search':
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self.handle_search(params)
+        elif url.path == '/api/review/due':
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self.handle_review_due(params)
+        elif url.path == '/api/metrics':
+            self.send_body(metrics.render().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8')
+        elif static_files and not url.path.startswith('/api/'):
+            self.handle_static(url.path)
         else:
             self.send_error(404)
     
-    def do_POST(self):
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode('utf-8')
+    def route_post(self):
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            # 본문 경계를 알 수 없으므로 연결도 닫음
+            self.send_json({'error': 'Invalid Content-Length'}, 400, headers={'Connection': 'close'})
+            return
+        try:
+            admission.check_body(content_length, BODY_LIMITS.get(self.path, MAX_BODY_BYTES))
+        except AdmissionError as e:
+            # 본문을 읽지 않고 거절 - 남은 본문이 다음 요청으로 읽히지 않게 연결을 닫음
+            self.send_rejected(e, {'Connection': 'close'})
+            return
+        body = self.rfile.read(content_length)
         
         try:
-            data = json.loads(body)
+            data = json.loads(body.decode('utf-8'))
         except:
             self.send_json({'error': 'Invalid JSON'}, 400)
             return
+        if not isinstance(data, dict):
+            self.send_json({'error': 'Invalid JSON'}, 400)
+            return
+        if not self.admit(self.path, data):
+            return
         
         if self.path == '/api/chat':
             self.handle_chat(data)
+        elif self.path == '/api/chat/stream':
+            self.handle_chat_stream(data)
+        elif self.path == '/api/tts':
+            self.handle_tts(data)
+        elif self.path == '/api/progress/sync':
+            self.handle_progress_sync(data)
+        elif self.path == '/api/grade':
+            self.handle_grade(data)
         else:
             self.send_error(404)
     
     def handle_chat(self, data):
         """챗봇 API - Vertex AI Gemini"""
-        if not client:
-            self.send_json({'error': 'Gemini not configured'}, 500)
-            return
+        with chat_phase.time(phase='prepare'):
+            request = self.parse_chat_request(data)
+            if request is None:
+                return
+            message, history, session = request
+            day = self.chat_day(data)
+            
+            use_cache = not self.cache_bypassed()
+            cache_key = make_cache_key(message, history, CHAT_MODEL, prompt_contexts.prompt_key(day))
         
-        message = data.get('message', '')
-        history = data.get('history', [])
+        if use_cache:
+            with chat_phase.time(phase='cache'):
+                cached = reply_cache.get(cache_key)
+            if cached is not None:
+                self.finish_chat_turn(session, message, cached)
+                self.send_json(self.chat_payload(session, cached), headers={'X-Cache': 'HIT'})
+                return
         
-        if not message:
-            self.send_json({'error': 'Message required'}, 400)
-            return
+        def generate():
+            # Gemini 호출 (Day 컨텍스트는 캐시 참조) → 응답 추출 (없으면 None)
+            # 자리가 없으면 AdmissionError - 같이 기다리던 요청도 같은 503을 받음
+            with admission.upstream():
+                response = generate_with_context(day, lambda config, note: gemini_generate(
+                    'chat',
+                    model=CHAT_MODEL,
+                    contents=build_chat_contents(message, history, note),
+                    config=config
+                ))
+            if response.candidates and response.candidates[0].content.parts:
+                reply = response.candidates[0].content.parts[0].text
+                if reply:
+                    reply_cache.set(cache_key, reply)
+                return reply
+            return None
         
         try:
-            # 대화 기록 구성
-            contents = []
-            for h in history:
-                role = 'user' if h.get('role') == 'user' else 'model'
-                contents.append(types.Content(role=role, parts=[types.Part(text=h.get('text', ''))]))
-            
-            # 현재 메시지 추가
-            contents.append(types.Content(role='user', parts=[types.Part(text=message)]))
+            # 같은 키로 진행 중인 호출이 있으면 그 결과를 같이 받음 (X-Cache-Bypass면 항상 직접 호출)
+            with chat_phase.time(phase='upstream'):
+                reply, shared = chat_flight.do(cache_key, generate) if use_cache else (generate(), False)
             
-            # Gemini 호출
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",  # 최신 모델
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    system_instruction=CHATBOT_SYSTEM_PROMPT,
-                    max_output_tokens=500,
-                    temperature=0.7
-                )
-            )
-            
-            # 응답 추출
-            if response.candidates and response.candidates[0].content.parts:
-                reply = response.candidates[0].content.parts[0].text
-                self.send_json({'reply': reply})
-            else:
+            if reply is None:
                 self.send_json({'error': 'No response'}, 500)
+                return
+            if reply:
+                self.finish_chat_turn(session, message, reply)
+            status = 'SHARED' if shared else ('MISS' if use_cache else 'BYPASS')
+            self.send_json(self.chat_payload(session, reply), headers={'X-Cache': status})
                 
+        except AdmissionError as e:
+            self.send_rejected(e)
         except Exception as e:
             print(f"❌ Chat error: {e}")
+            errors_total.inc(where='chat', type=type(e).__name__)
             self.send_json({'error': str(e)}, 500)
     
-    def send_json(self, data, status=200):
+    def handle_chat_stream(self, data):
+        """챗봇 스트리밍 API - 생성되는 대로 SSE(text/event-stream)로 전송
+
+        이벤트 종류:
+        - chunk: { text } 부분 응답
+        - done:  { reply, finish_reason, usage, session_id? } 전체 응답과 사용량
+        - error: { error }
+        """
+        with chat_phase.time(phase='prepare'):
+            request = self.parse_chat_request(data)
+            if request is None:
+                return
+            message, history, session = request
+            day = self.chat_day(data)
+            
+            use_cache = not self.cache_bypassed()
+            cache_key = make_cache_key(message, history, CHAT_MODEL, prompt_contexts.prompt_key(day))
+        
+        with chat_phase.time(phase='cache'):
+            cached = reply_cache.get(cache_key) if use_cache else None
+        
+        if cached is not None:
+            self.send_sse_reply('HIT', session, message, cached)
+            return
+        
+        def stream():
+            # 응답 헤더(200)를 보내기 전에 Gemini 호출 자리를 잡아야 503으로 거절할 수 있음
+            with admission.upstream():
+                self.send_sse_headers('MISS' if use_cache else 'BYPASS')
+                return self.stream_reply(message, history, session, day, cache_key)
+        
+        try:
+            # 같은 질문이 이미 생성 중이면(/api/chat 포함) 그 응답이 끝날 때까지 기다렸다가 한 번에 받음
+            # (X-Cache-Bypass면 항상 직접 호출)
+            with chat_phase.time(phase='upstream'):
+                reply, shared = chat_flight.do(cache_key, stream) if use_cache else (stream(), False)
+        except AdmissionError as e:
+            self.send_rejected(e)
+            return
+        except Exception as e:
+            if self.status_code is None:
+                # 먼저 온 요청의 Gemini 오류를 같이 받음 - 직접 호출했다면 이미 error 이벤트를 보냄
+                self.send_sse_headers('SHARED')
+                self.try_send_sse('error', {'error': str(e)})
+            return
+        if shared:
+            self.send_sse_reply('SHARED', session, message, reply)
+    
+    def send_sse_headers(self, cache_status):
+        self.send_response(200)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')  # 프록시 버퍼링 방지
+        self.send_header('Connection', 'close')      # 길이를 미리 알 수 없으므로 연결 종료로 끝을 알림
+        self.send_header('X-Cache', cache_status)
+        self.end_headers()
+    
+    def send_sse_reply(self, cache_status, session, message, reply):
+        """이미 완성된 응답(캐시 적중, 나눠 받은 응답)을 chunk 하나 + done으로 전송"""
+        self.send_sse_headers(cache_status)
+        if not reply:
+            self.try_send_sse('error', {'error': 'No response'})
+            return
+        self.finish_chat_turn(session, message, reply)
+        self.send_sse('chunk', {'text': reply})
+        self.send_sse('done', {
+            **self.chat_payload(session, reply),
+            'finish_reason': 'STOP',
+            'usage': None,
+            'cached': True
+        })
+    
+    def stream_reply(self, message, history, session, day, cache_key):
+        """Gemini 스트리밍 응답을 chunk 이벤트로 중계하고 done/error 이벤트로 마무리 → 전체 응답 (없으면 None)
+
+        클라이언트가 끊겨도 같이 기다리는 요청을 위해 응답은 끝까지 받는다.
+        캐시 콘텐츠가 사라졌고 아직 보낸 청크가 없으면 기본 프롬프트로 바로 다시 시도한다.
+        Gemini 오류는 error 이벤트를 보낸 뒤 다시 던져서 기다리던 요청도 같은 오류를 받게 한다.
+        """
+        reply_parts = []
+        finish_reason = None
+        usage = None
+        connected = True
+        context, note = prompt_contexts.context(day)
+        while True:
+            try:
+                stream = gemini_stream(
+                    'chat_stream',
+                    model=CHAT_MODEL,
+                    contents=build_chat_contents(message, history, note),
+                    config=build_chat_config(context)
+                )
+                for chunk in stream:
+                    if chunk.candidates and chunk.candidates[0].finish_reason:
+                        finish_reason = getattr(chunk.candidates[0].finish_reason, 'name', str(chunk.candidates[0].finish_reason))
+                    if chunk.usage_metadata:
+                        usage = chunk.usage_metadata
+                    text = chunk.text
+                    if text:
+                        reply_parts.append(text)
+                        connected = connected and self.try_send_sse('chunk', {'text': text})
+                break
+            except Exception as e:
+                if 'cached_content' in context and is_missing_cache_error(e):
+                    prompt_contexts.invalidate()  # 다음 요청에서 다시 등록
+                    if not reply_parts:
+                        print(f"⚠️ 프롬프트 캐시 없음 (Day {day}) - 기본 프롬프트로 재시도: {e}")
+                        context, note = prompt_contexts.fallback(), None
+                        continue
+                print(f"❌ Chat stream error: {e}")
+                errors_total.inc(where='chat_stream', type=type(e).__name__)
+                if connected:
+                    self.try_send_sse('error', {'error': str(e)})
+                raise
+        
+        reply = ''.join(reply_parts)
+        if reply and finish_reason in (None, 'STOP'):
+            reply_cache.set(cache_key, reply)
+        if connected:
+            if reply:
+                self.finish_chat_turn(session, message, reply)
+            self.try_send_sse('done', {
+                **self.chat_payload(session, reply),
+                'finish_reason': finish_reason,
+                'usage': usage_to_dict(usage)
+            })
+        return reply or None
+    
+    def handle_tts(self, params):
+        """TTS API - Gemini Native TTS, (텍스트, 음성, 언어, 속도) 해시로 캐시
+
+        GET /api/tts?text=...&lang=en 또는 POST /api/tts { text, lang, voice?, speed? }
+        응답은 audio/wav. ETag가 캐시 키이므로 If-None-Match가 맞으면 합성 없이 304.
+        HEAD는 캐시에 있으면 200(본문 없음), 없으면 합성하지 않고 404.
+        """
+        text = params.get('text', '')
+        lang = str(params.get('lang', 'en'))
+        
+        if not isinstance(text, str):
+            self.send_json({'error': 'Invalid text'}, 400)
+            return
+        text = text.strip()
+        if not text:
+            self.send_json({'error': 'Text is required'}, 400)
+            return
+        if len(text) > TTS_MAX_CHARS:
+            self.send_json({'error': f'Text too long (max {TTS_MAX_CHARS})'}, 400)
+            return
+        if lang not in ('en', 'ko'):
+            self.send_json({'error': 'Unsupported lang'}, 400)
+            return
+        try:
+            speed = float(params.get('speed', 1.0))
+        except (TypeError, ValueError):
+            speed = math.nan
+        if not math.isfinite(speed):
+            self.send_json({'error': 'Invalid speed'}, 400)
+            return
+        speed = min(max(speed, 0.5), 2.0)
+        voice = params.get('voice')
+        if voice is not None and not isinstance(voice, str):
+            self.send_json({'error': 'Invalid voice'}, 400)
+            return
+        voice = resolve_voice(lang, voice)
+        if not VOICE_PATTERN.match(voice):
+            self.send_json({'error': 'Invalid voice'}, 400)
+            return
+        
+        key = audio_key(text, voice, lang, speed)
+        etag = f'"{key}"'
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_cors_headers()
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            self.end_headers()
+            return
+        
+        audio = audio_cache.get(key)
+        cache_status = 'HIT'
+        if audio is None:
+            if self.command == 'HEAD':
+                self.send_json({'error': 'Not cached'}, 404, headers={'X-Cache': 'MISS'})
+                return
+            if not tts_synthesizer:
+                self.send_json({'error': 'Gemini not configured'}, 500)
+                return
+            try:
+                with admission.upstream(), gemini_latency.time(call='tts'):
+                    audio = tts_synthesizer.synthesize(text, voice, lang, speed)
+            except AdmissionError as e:
+                self.send_rejected(e)
+                return
+            except Exception as e:
+                print(f"❌ TTS error: {e}")
+                errors_total.inc(where='gemini_tts', type=type(e).__name__)
+                self.send_json({'error': str(e)}, 500)
+                return
+            audio_cache.put(key, audio)
+            cache_status = 'MISS'
+        
+        self.send_response(200)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'audio/wav')
+        self.send_header('Content-Length', str(len(audio)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.send_header('X-Cache', cache_status)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(audio)
+    
+    def handle_progress_sync(self, data):
+        """진행 상황 동기화 - { user_id, ops: [{op, kind, id, data?, grade?, ts}], since } → 적용 + since 이후 변경"""
+        user_id = data.get('user_id')
+        ops = data.get('ops', [])
+        since = data.get('since', 0)
+        if not ProgressStore.is_valid_user(user_id):
+            self.send_json({'error': 'Invalid user_id'}, 400)
+            return
+        if not isinstance(ops, list) or not isinstance(since, int) or since < 0:
+            self.send_json({'error': 'Invalid ops/since'}, 400)
+            return
+        try:
+            self.send_json(progress_store.sync(user_id, ops, since))
+        except ProgressError as e:
+            self.send_json({'error': str(e)}, 400)
+    
+    def handle_review_due(self, params):
+        """오늘 복습할 문장 - GET /api/review/due?user_id=...&limit=20"""
+        user_id = params.get('user_id')
+        if not ProgressStore.is_valid_user(user_id):
+            self.send_json({'error': 'Invalid user_id'}, 400)
+            return
+        try:
+            limit = min(max(int(params.get('limit', 20)), 1), 100)
+        except ValueError:
+            self.send_json({'error': 'Invalid limit'}, 400)
+            return
+        items, total = progress_store.due(user_id, limit)
+        self.send_json({'items': items, 'total_due': total})
+    
+    def handle_static(self, path):
+        """docs/ 정적 파일 - 사이드카/즉석 압축, 강한 ETag, 304"""
+        entry = static_files.get(path, self.headers.get('Accept-Encoding', ''))
+        if entry is None:
+            self.send_error(404)
+            return
+        
+        common = [('ETag', entry['etag']), ('Cache-Control', entry['cache_control'])]
+        if entry['vary']:
+            common.append(('Vary', 'Accept-Encoding'))
+        
+        if_none_match = self.headers.get('If-None-Match', '')
+        if if_none_match.strip() == '*' or entry['etag'] in if_none_match:
+            self.send_response(304)
+            for name, value in common:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', entry['content_type'])
+        self.send_header('Content-Length', str(len(entry['body'])))
+        if entry['encoding']:
+            self.send_header('Content-Encoding', entry['encoding'])
+        for name, value in common:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(entry['body'])
+    
+    def handle_search(self, params):
+        """검색 API - GET /api/search?q=grab&limit=20&type=example|pattern|vocabulary"""
+        query = params.get('q', '').strip()
+        doc_type = params.get('type') or None
+        
+        if not query:
+            self.send_json({'error': 'Query required'}, 400)
+            return
+        if doc_type not in (None, 'example', 'pattern', 'vocabulary'):
+            self.send_json({'error': 'Invalid type'}, 400)
+            return
+        try:
+            limit = min(max(int(params.get('limit', 20)), 1), 100)
+        except ValueError:
+            self.send_json({'error': 'Invalid limit'}, 400)
+            return
+        
+        started = time.perf_counter()
+        results, total = search_index.search(query, limit, doc_type)
+        self.send_json({
+            'query': query,
+            'total': total,
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3)
+        })
+    
+    def handle_grade(self, data):
+        """답안 일괄 채점 - { items: [{ id, lang: 'en'|'ko', alternatives: [...] }], threshold? }"""
+        items = data.get('items')
+        threshold = data.get('threshold', GRADE_THRESHOLD)
+        if not isinstance(items, list) or not 0 < len(items) <= GRADE_MAX_ITEMS:
+            self.send_json({'error': f'items must be a list of 1-{GRADE_MAX_ITEMS}'}, 400)
+            return
+        if not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1:
+            self.send_json({'error': 'Invalid threshold'}, 400)
+            return
+        for item in items:
+            alternatives = item.get('alternatives') if isinstance(item, dict) else None
+            if (not isinstance(alternatives, list) or len(alternatives) > GRADE_MAX_ALTERNATIVES
+                    or not all(isinstance(a, str) and len(a) <= GRADE_MAX_CHARS for a in alternatives)
+                    or not isinstance(item.get('id'), str) or item.get('lang') not in SCORERS):
+                self.send_json({'error': 'Invalid item'}, 400)
+                return
+        
+        started = time.perf_counter()
+        results = grader.grade(items, threshold)
+        self.send_json({
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3)
+        })
+    
+    def admit(self, route, data):
+        """챗봇/TTS 경로는 클라이언트별 토큰 버킷 확인 - 넘으면 429 응답 후 False"""
+        if route not in RATE_LIMITED_ROUTES:
+            return True
+        try:
+            admission.check_rate(self.client_key(data))
+        except AdmissionError as e:
+            self.send_rejected(e)
+            return False
+        return True
+    
+    def client_key(self, data):
+        """요청 빈도 제한 단위 - 세션 모드면 유효한 session_id, 아니면 클라이언트 IP"""
+        session_id = data.get('session_id')
+        if RATE_LIMIT_KEY == 'session' and session_id and SessionStore.is_valid_id(session_id):
+            return f'session:{session_id}'
+        forwarded = self.headers.get('X-Forwarded-For', '')
+        if TRUST_PROXY and forwarded:
+            return forwarded.split(',')[-1].strip()  # 우리 프록시가 마지막에 붙인 주소
+        return self.client_address[0]
+    
+    def send_rejected(self, error, headers=None):
+        self.send_json({'error': str(error)}, error.status, headers={**error.headers(), **(headers or {})})
+    
+    def parse_chat_request(self, data):
+        """챗봇 요청 검증 → (message, history, session) 또는 오류 응답 후 None
+
+        요청에 session_id 필드가 있으면 서버 세션 모드: 클라이언트가 보낸 history는
+        무시하고 서버가 보관한 기록을 쓴다. 값이 비어 있으면 새 세션을 만든다.
+        """
+        if not client:
+            self.send_json({'error': 'Gemini not configured'}, 500)
+            return None
+        
+        message = data.get('message', '')
+        if not isinstance(message, str):
+            self.send_json({'error': 'message must be a string'}, 400)
+            return None
+        if not message:
+            self.send_json({'error': 'Message required'}, 400)
+            return None
+        
+        if 'session_id' not in data:
+            history = data.get('history', [])
+            if not self.is_valid_history(history):
+                self.send_json({'error': 'history must be a list of {role, text}'}, 400)
+                return None
+            return message, history, None
+        
+        session_id = data.get('session_id')
+        if session_id and not SessionStore.is_valid_id(session_id):
+            self.send_json({'error': 'Invalid session_id'}, 400)
+            return None
+        session = session_store.get(session_id)
+        return message, session.history(), session
+    
+    @staticmethod
+    def is_valid_history(history):
+        return isinstance(history, list) and all(
+            isinstance(h, dict) and isinstance(h.get('text', ''), str) and isinstance(h.get('role', ''), str)
+            for h in history
+        )
+    
+    def chat_day(self, data):
+        """요청의 day (학생이 보고 있는 Day) - 없거나 잘못된 값이면 None (기본 프롬프트)"""
+        day = data.get('day')
+        return day if isinstance(day, int) and not isinstance(day, bool) else None
+    
+    def finish_chat_turn(self, session, message, reply):
+        if session is not None:
+            session_store.append(session, message, reply)
+    
+    def chat_payload(self, session, reply):
+        payload = {'reply': reply}
+        if session is not None:
+            payload['session_id'] = session.id
+        return payload
+    
+    def try_send_sse(self, event, data):
+        """SSE 전송 - 클라이언트가 끊겼으면 False"""
+        try:
+            self.send_sse(event, data)
+            return True
+        except OSError as e:
+            print("⚠️ Chat stream: 클라이언트 연결 끊김")
+            errors_total.inc(where='chat_stream', type=type(e).__name__)
+            return False
+    
+    def send_sse(self, event, data):
+        payload = json.dumps(data, ensure_ascii=False)
+        self.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode('utf-8'))
+        self.wfile.flush()
+    
+    def cache_bypassed(self):
+        """X-Cache-Bypass: 1 또는 Cache-Control: no-cache 요청이면 응답 캐시를 건너뜀"""
+        if self.headers.get('X-Cache-Bypass', '').lower() in ('1', 'true', 'yes'):
+            return True
+        return 'no-cache' in self.headers.get('Cache-Control', '').lower()
+    
+    def send_json(self, data, status=200, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_body(body, 'application/json', status, headers)
+    
+    def send_body(self, body, content_type, status=200, headers=None):
+        """Content-Length를 붙여 전송 - COMPRESS_MIN_BYTES 이상이면 gzip/brotli 압축"""
+        compressible = len(body) >= COMPRESS_MIN_BYTES and is_compressible(content_type)
+        encoding = negotiate(self.headers.get('Accept-Encoding', '')) if compressible else None
+        if encoding:
+            body = compress(body, encoding)
+        
         self.send_response(status)
         self.send_cors_headers()
-        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if compressible:
+            self.send_header('Vary', 'Accept-Encoding')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        if self.command != 'HEAD':
+            self.wfile.write(body)
     
     def send_cors_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Cache-Control, X-Cache-Bypass, If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'X-Cache, ETag, Retry-After')
     
     def log_message(self, format, *args):
         print(f"[{self.address_string()}] {args[0]}")
 
 
-if __name__ == '__main__':
-    print(f"🚀 Kongdan 백엔드 서버 시작: http://localhost:{PORT}")
+def run_server(port=PORT, workers=MAX_WORKERS, queue_size=MAX_QUEUE, static_dir=STATIC_DIR or None):
+    """서버 실행 - SIGINT/SIGTERM을 받으면 처리 중인 요청을 마치고 종료"""
+    global static_files
+    if static_dir:
+        static_files = StaticFiles(static_dir, COMPRESS_MIN_BYTES)
+        metrics.add_collector('kongdan_static', '정적 파일', static_files.stats)
+    admission.gate.resize(*upstream_limits(workers))
+    server = PooledHTTPServer(('', port), RequestHandler, workers=workers, queue_size=queue_size)
+    metrics.add_collector('kongdan_keepalive', 'keep-alive 유휴 연결', server.idle.stats)
+
+    def request_shutdown(signum, frame):
+        print("\n🛑 종료 요청 수신 - 처리 중인 요청을 마무리합니다...")
+        # serve_forever()와 같은 스레드에서 shutdown()을 부르면 교착되므로 별도 스레드 사용
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+    print(f"🚀 Kongdan 백엔드 서버 시작: http://localhost:{port} (워커 {workers}개, 대기열 {queue_size})")
+    print(f"🚦 입장 제어: 클라이언트별 초당 {RATE_LIMIT:g}회 (버스트 {RATE_BURST}), "
+          f"Gemini 동시 호출 {admission.gate.limit}개 + 대기 {admission.gate.queue_size}개 ({UPSTREAM_QUEUE_WAIT:g}초)")
     print(f"📝 챗봇 API: POST /api/chat {{ message: '...', history: [...] }}")
-    
-    server = HTTPServer(('', PORT), RequestHandler)
-    server.serve_forever()
+    print("📡 스트리밍: POST /api/chat/stream (Server-Sent Events)")
+    print("🔎 검색 API: GET /api/search?q=...")
+    print("📈 메트릭: GET /api/metrics (Prometheus)")
+    if static_files:
+        print(f"📁 정적 파일: {static_files.root} → http://localhost:{port}/")
+    print("🔊 TTS API: POST /api/tts { text: '...', lang: 'en' } 또는 GET /api/tts?text=...")
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        reply_cache.close()
+        progress_store.close()
+        prompt_contexts.close()
+        print("👋 서버 종료 완료")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Kongdan 백엔드 서버')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='동시 처리 워커 수')
+    parser.add_argument('--queue', type=int, default=MAX_QUEUE, help='워커 대기열 크기')
+    parser.add_argument('--static', nargs='?', const=str(ROOT_DIR / 'docs'), default=STATIC_DIR or None,
+                        metavar='DIR', help='정적 파일도 제공 (DIR 생략 시 docs/)')
+    args = parser.parse_args()
+
+    run_server(args.port, args.workers, args.queue, args.static)
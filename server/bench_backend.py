@@ -0,0 +1,309 @@
+"""
+backend.py 부하 테스트 / 지연시간 벤치마크
+- 네트워크 없이 가짜 genai.Client로 backend.py를 띄움 (지연, 토큰 스트리밍, 오류율 조절 가능)
+- /api/health, /api/chat, /api/chat/stream을 지정한 동시성으로 호출
+- 처리량, p50/p95/p99 지연, 오류 수, 요청당 메모리를 JSON으로 저장 → 커밋 간 비교
+
+사용법:
+    python bench_backend.py --concurrency 32 --requests 500 --latency 0.8 --out bench.json
+    python bench_backend.py --compare bench_before.json --out bench_after.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import subprocess
+import tracemalloc
+import http.client
+import types as pytypes
+from pathlib import Path
+from collections import Counter
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ===== 가짜 Gemini 클라이언트 =====
+class FakeOptions:
+    def __init__(self, latency=0.5, jitter=0.2, error_rate=0.0, tokens=30, token_delay=0.01):
+        self.latency = latency          # 첫 토큰까지 기본 지연 (초)
+        self.jitter = jitter            # 지연 변동 비율 (0.2 = ±20%)
+        self.error_rate = error_rate    # 호출 실패 확률
+        self.tokens = tokens            # 응답 토큰 수
+        self.token_delay = token_delay  # 스트리밍 토큰 간 간격 (초)
+
+
+class _FakeConfig:
+    """google.genai.types.* 자리에 쓰는 kwargs 보관용 객체"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _make_fake_types():
+    module = pytypes.ModuleType('google.genai.types')
+    # 어떤 types.Xxx(...)를 불러도 kwargs만 보관하는 클래스를 돌려줌
+    module.__getattr__ = lambda name: type(name, (_FakeConfig,), {})
+    return module
+
+
+class FakeModels:
+    def __init__(self, options):
+        self.options = options
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _delay(self):
+        jitter = self.options.latency * self.options.jitter
+        time.sleep(max(0.0, self.options.latency + random.uniform(-jitter, jitter)))
+
+    def _maybe_fail(self):
+        with self._lock:
+            self.calls += 1
+        if random.random() < self.options.error_rate:
+            raise RuntimeError('fake upstream error (503 UNAVAILABLE)')
+
+    def _response(self, text, finish_reason='STOP', usage=True):
+        return SimpleNamespace(
+            text=text,
+            candidates=[SimpleNamespace(
+                content=SimpleNamespace(parts=[SimpleNamespace(text=text, inline_data=None)]),
+                finish_reason=SimpleNamespace(name=finish_reason) if finish_reason else None
+            )],
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=120,
+                candidates_token_count=self.options.tokens,
+                total_token_count=120 + self.options.tokens,
+                cached_content_token_count=0
+            ) if usage else None
+        )
+
+    def generate_content(self, model, contents, config=None):
+        self._maybe_fail()
+        self._delay()
+        time.sleep(self.options.tokens * self.options.token_delay)
+        return self._response(' '.join(['tok'] * self.options.tokens))
+
+    def count_tokens(self, model, contents):
+        # 대충 글자 2개당 1토큰 (한글/영어 섞인 프롬프트 기준)
+        return SimpleNamespace(total_tokens=len(contents) // 2)
+
+    def generate_content_stream(self, model, contents, config=None):
+        self._maybe_fail()
+        self._delay()
+        for i in range(self.options.tokens):
+            last = i == self.options.tokens - 1
+            yield self._response('tok ', finish_reason='STOP' if last else None, usage=last)
+            time.sleep(self.options.token_delay)
+
+
+class FakeCaches:
+    def __init__(self):
+        self._count = 0
+
+    def create(self, model, config=None):
+        self._count += 1
+        return SimpleNamespace(name=f'cachedContents/fake-{self._count}')
+
+    def delete(self, name):
+        pass
+
+
+class FakeClient:
+    options = FakeOptions()
+
+    def __init__(self, **kwargs):
+        self.models = FakeModels(FakeClient.options)
+        self.caches = FakeCaches()
+
+
+def install_fake_genai(options):
+    """backend.py import 전에 google.genai를 가짜로 바꿔치기"""
+    FakeClient.options = options
+    genai = pytypes.ModuleType('google.genai')
+    genai.Client = FakeClient
+    genai.types = _make_fake_types()
+    if 'google' not in sys.modules:
+        try:
+            import google  # 다른 google.* 패키지가 설치된 경우 그대로 둠
+        except ImportError:
+            sys.modules['google'] = pytypes.ModuleType('google')
+    sys.modules['google'].genai = genai
+    sys.modules['google.genai'] = genai
+    sys.modules['google.genai.types'] = genai.types
+
+
+# ===== 부하 생성 =====
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def one_request(port, scenario, message):
+    """(상태 코드, 전체 지연, 첫 바이트까지 지연)"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    started = time.perf_counter()
+    try:
+        if scenario == 'health':
+            conn.request('GET', '/api/health')
+        else:
+            path = '/api/chat/stream' if scenario == 'chat_stream' else '/api/chat'
+            body = json.dumps({'message': message, 'history': [], 'day': 1})  # 프런트엔드처럼 Day를 보내 프롬프트 캐시 경로도 탐
+            conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read(1)
+        first_byte = time.perf_counter() - started
+        body = response.read()
+        status = response.status
+        # SSE는 200으로 시작해도 error 이벤트로 끝날 수 있음
+        if scenario == 'chat_stream' and b'event: error' in body:
+            status = 'stream_error'
+        return status, time.perf_counter() - started, first_byte
+    except Exception as e:
+        return type(e).__name__, time.perf_counter() - started, None
+    finally:
+        conn.close()
+
+
+def run_scenario(port, scenario, requests, concurrency, distinct_messages):
+    # 시나리오/실행마다 질문을 달리해서 이전 시나리오의 응답 캐시에 걸리지 않게
+    run_id = random.getrandbits(32)
+    messages = [f"{scenario} question {i} ({run_id})" for i in range(distinct_messages or requests)]
+
+    tracemalloc.reset_peak()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda i: one_request(port, scenario, messages[i % len(messages)]),
+            range(requests)
+        ))
+    elapsed = time.perf_counter() - started
+    memory_after, memory_peak = tracemalloc.get_traced_memory()
+
+    latencies = sorted(r[1] * 1000 for r in results if r[0] == 200)
+    first_bytes = sorted(r[2] * 1000 for r in results if r[0] == 200 and r[2] is not None)
+    errors = Counter(str(r[0]) for r in results if r[0] != 200)
+
+    def summary(values):
+        return {
+            'p50': round(percentile(values, 50), 2) if values else None,
+            'p95': round(percentile(values, 95), 2) if values else None,
+            'p99': round(percentile(values, 99), 2) if values else None,
+            'mean': round(sum(values) / len(values), 2) if values else None,
+            'max': round(values[-1], 2) if values else None,
+        }
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 2),
+        'ok': len(latencies),
+        'errors': dict(errors),
+        'latency_ms': summary(latencies),
+        'first_byte_ms': summary(first_bytes),
+        'memory': {
+            'peak_kb': round(memory_peak / 1024, 1),
+            'retained_kb': round((memory_after - memory_before) / 1024, 1),
+            'peak_per_request_kb': round((memory_peak - memory_before) / 1024 / requests, 2),
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """이전 결과 대비 변화 출력"""
+    print(f"\n📊 비교: {old.get('commit')} → {new.get('commit')}")
+    for name, result in new['scenarios'].items():
+        before = old.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        for label, path in [('처리량 rps', ('throughput_rps',)), ('p50 ms', ('latency_ms', 'p50')),
+                            ('p95 ms', ('latency_ms', 'p95')), ('p99 ms', ('latency_ms', 'p99'))]:
+            a, b = before, result
+            for key in path:
+                a, b = a.get(key) if a else None, b.get(key) if b else None
+            if a and b:
+                print(f"  {name:12s} {label:10s} {a:>10} → {b:>10} ({(b - a) / a:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='backend.py 부하 테스트 (가짜 Gemini 클라이언트)')
+    parser.add_argument('--scenarios', default='health,chat,chat_stream', help='쉼표로 구분: health, chat, chat_stream')
+    parser.add_argument('--requests', type=int, default=200, help='시나리오별 요청 수')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 클라이언트 수')
+    parser.add_argument('--distinct', type=int, default=0, help='서로 다른 질문 수 (0이면 전부 다름 → 캐시 미적중)')
+    parser.add_argument('--workers', type=int, default=16, help='서버 워커 수')
+    parser.add_argument('--queue', type=int, default=64, help='서버 대기열 크기')
+    parser.add_argument('--latency', type=float, default=0.5, help='가짜 Gemini 첫 토큰 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.2, help='지연 변동 비율')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='가짜 Gemini 실패 확률')
+    parser.add_argument('--tokens', type=int, default=30, help='응답 토큰 수')
+    parser.add_argument('--token-delay', type=float, default=0.01, help='스트리밍 토큰 간격 (초)')
+    parser.add_argument('--admission', action='store_true',
+                        help='입장 제어(요청 빈도 제한, Gemini 동시 호출 제한)를 켠 채로 측정 - 거절은 429/503 오류로 집계')
+    parser.add_argument('--out', type=Path, default=Path('bench_results.json'))
+    parser.add_argument('--compare', type=Path, help='비교할 이전 결과 JSON')
+    args = parser.parse_args()
+
+    options = FakeOptions(args.latency, args.jitter, args.error_rate, args.tokens, args.token_delay)
+    install_fake_genai(options)
+    tracemalloc.start()
+
+    # 모든 요청이 같은 IP에서 오므로 기본은 입장 제어를 끄고 처리 성능만 잼
+    if not args.admission:
+        os.environ['KONGDAN_RATE_LIMIT'] = '0'
+        os.environ['KONGDAN_UPSTREAM_CONCURRENCY'] = '0'
+    import backend
+    backend.admission.gate.resize(*backend.upstream_limits(args.workers))
+
+    class QuietHandler(backend.RequestHandler):
+        def log_message(self, format, *log_args):
+            pass
+
+    server = backend.PooledHTTPServer(('127.0.0.1', 0), QuietHandler, workers=args.workers, queue_size=args.queue)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🏁 벤치마크 서버: 127.0.0.1:{port} (워커 {args.workers}, 가짜 지연 {args.latency}s)")
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        'scenarios': {},
+    }
+    try:
+        for scenario in [s.strip() for s in args.scenarios.split(',') if s.strip()]:
+            result = run_scenario(port, scenario, args.requests, args.concurrency, args.distinct)
+            results['scenarios'][scenario] = result
+            lat = result['latency_ms']
+            print(f"  {scenario:12s} {result['throughput_rps']:>8} rps  p50 {lat['p50']}ms  p95 {lat['p95']}ms  "
+                  f"p99 {lat['p99']}ms  오류 {sum(result['errors'].values())}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    args.out.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"💾 결과 저장: {args.out}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding='utf-8')), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+서버 측 챗봇 세션
+- 클라이언트는 session_id + 새 메시지만 보내고, 대화 기록은 서버가 보관
+- 기록은 토큰 예산 안으로 잘라서 유지 (선택: 잘린 앞부분은 백그라운드에서 요약으로 압축 - 응답을 기다리게 하지 않음)
+- 오래 안 쓴 세션은 TTL / LRU로 정리
+"""
+
+import re
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 - 영문은 4글자당 1토큰, 한글 등 비ASCII 문자는 글자당 1토큰"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+class ChatSession:
+    def __init__(self, session_id):
+        self.id = session_id
+        self.turns = []       # [{'role': 'user'|'model', 'text': ...}]
+        self.summary = ''     # 잘려나간 예전 대화 요약
+        self.unsummarized = []  # 잘렸지만 아직 요약에 안 들어간 턴
+        self.summarizing = False
+        self.last_used = time.time()
+        self.lock = threading.Lock()
+
+    def history(self):
+        """Gemini에 보낼 대화 기록 (요약이 있으면 맨 앞에 붙임)"""
+        with self.lock:
+            turns = list(self.turns)
+            if self.summary:
+                turns.insert(0, {'role': 'user', 'text': f"(이전 대화 요약) {self.summary}"})
+            return turns
+
+
+class SessionStore:
+    """세션 보관소 (스레드 안전)
+
+    summarizer(summary, dropped_turns) -> str 를 넘기면 예산을 넘어 잘린 대화를
+    기존 요약과 합쳐 새 요약으로 만든다 (백그라운드 스레드, 세션당 한 번에 하나).
+    없으면 잘린 대화는 그냥 버린다. 요약이 실패하면 그 턴들은 요약 없이 버린다.
+    """
+
+    def __init__(self, max_sessions=1000, ttl=3600, token_budget=1500, summarizer=None, summary_workers=2):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self._executor = ThreadPoolExecutor(summary_workers, thread_name_prefix='kongdan-summary') if summarizer else None
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.summarized = 0
+        self.summary_failures = 0
+
+    @staticmethod
+    def is_valid_id(session_id):
+        return isinstance(session_id, str) and bool(SESSION_ID_PATTERN.match(session_id))
+
+    def get(self, session_id=None):
+        """세션 조회 - 없거나 만료됐으면 새로 만든다 (session_id가 비어 있으면 새 ID 발급)"""
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            if not session_id:
+                session_id = uuid.uuid4().hex
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = ChatSession(session_id)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted += 1
+            self._sessions.move_to_end(session_id)
+            session.last_used = now
+            return session
+
+    def append(self, session, message, reply):
+        """한 턴(질문 + 답) 추가 후 토큰 예산에 맞게 자르기 - 요약은 백그라운드로 넘기고 바로 반환"""
+        start = False
+        with session.lock:
+            session.turns.append({'role': 'user', 'text': message})
+            session.turns.append({'role': 'model', 'text': reply})
+            session.last_used = time.time()
+
+            dropped = []
+            # 가장 최근 한 턴(질문+답)은 항상 남긴다
+            while len(session.turns) > 2 and self._session_tokens(session) > self.token_budget:
+                dropped.extend(session.turns[:2])
+                del session.turns[:2]
+            if dropped and self.summarizer:
+                session.unsummarized.extend(dropped)
+                start = not session.summarizing
+                session.summarizing = True
+
+        if start:
+            self._executor.submit(self._summarize, session)
+
+    def _summarize(self, session):
+        # 요약하는 동안 더 잘린 턴은 unsummarized에 쌓였다가 다음 바퀴에 이어서 요약
+        while True:
+            with session.lock:
+                dropped, session.unsummarized = session.unsummarized, []
+                if not dropped:
+                    session.summarizing = False
+                    return
+                summary = session.summary
+            try:
+                summary = self.summarizer(summary, dropped)
+            except Exception as e:
+                print(f"⚠️ 세션 요약 실패: {e}")
+                with self._lock:
+                    self.summary_failures += 1
+                continue
+            with session.lock:
+                session.summary = summary
+            with self._lock:
+                self.summarized += 1
+
+    def _session_tokens(self, session):
+        return estimate_tokens(session.summary) + sum(estimate_tokens(t['text']) for t in session.turns)
+
+    def _evict_expired(self, now):
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used < self.ttl:
+                break
+            del self._sessions[session_id]
+            self.evicted += 1
+
+    def stats(self):
+        with self._lock:
+            return {'active': len(self._sessions), 'evicted': self.evicted,
+                    'summarized': self.summarized, 'summary_failures': self.summary_failures}
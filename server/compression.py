@@ -0,0 +1,66 @@
+"""
+응답 압축 (gzip / brotli)
+- Accept-Encoding 협상 (q=0은 거부로 처리)
+- brotli 패키지가 없으면 gzip만 사용
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # 응답마다 즉석 압축하므로 최고 품질(11) 대신 속도 위주
+
+# 서버가 지원하는 인코딩 (선호 순)
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+# 인코딩 → 미리 압축해 둔 사이드카 파일 확장자 (data.js → data.js.gz)
+SIDECAR_SUFFIX = {'br': '.br', 'gzip': '.gz'}
+
+
+def is_compressible(content_type):
+    content_type = content_type.split(';')[0].strip().lower()
+    return (content_type.startswith('text/')
+            or content_type in ('application/json', 'application/javascript', 'image/svg+xml'))
+
+
+def accepted_encodings(header):
+    """Accept-Encoding 헤더 → q > 0인 인코딩 집합"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(name)
+    return accepted
+
+
+def negotiate(header, available=SUPPORTED_ENCODINGS):
+    """available 중 클라이언트가 받는 첫 인코딩, 없으면 None"""
+    accepted = accepted_encodings(header)
+    for encoding in available:
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def compress(body, encoding, best=False):
+    """best=True는 미리 압축해 두는 사이드카 파일용 (느리지만 더 작게)"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else BROTLI_QUALITY)
+    if encoding == 'gzip':
+        # mtime=0 → 같은 입력이면 같은 출력 (ETag 안정)
+        return gzip.compress(body, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+    raise ValueError(f'Unsupported encoding: {encoding}')
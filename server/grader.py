@@ -0,0 +1,198 @@
+"""
+말하기/쓰기 답안 채점 (POST /api/grade)
+- patterns.json 예문을 미리 정규화/토큰화한 색인 (id = "{day}_{pattern_id}_{index}", main.js 학습 항목 id와 같음)
+- 영어: 단어 단위 banded 편집 거리 정렬 - 철자가 비슷한 단어(colour/color)는 절반만 감점
+- 한글: 띄어쓰기 차이를 무시하고 글자 단위로 점수, 차이 표시는 어절 단위
+- 한 요청에 여러 문항 x 여러 음성 인식 후보 → 같은 (문장, 후보)는 한 번만 계산
+"""
+
+import re
+import threading
+import unicodedata
+
+from watched_json import WatchedJSON
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+# I'm / Im, don't / dont 처럼 아포스트로피만 다른 입력은 같게 봄 (키보드로 칠 때 자주 생략)
+APOSTROPHES = str.maketrans('', '', "'’‘`")
+
+NEAR_COST = 0.5       # 비슷한 단어로 바꿔 말함
+NEAR_SIMILARITY = 0.75
+DEFAULT_THRESHOLD = 0.85
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFC', text).translate(APOSTROPHES).lower()
+    return ' '.join(PUNCTUATION.sub(' ', text).split())
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def char_distance(a, b, band=None):
+    """글자 단위 편집 거리 - |i-j| <= band 범위만 계산, 넘으면 band+1"""
+    if band is None:
+        band = max(len(a), len(b))
+    if abs(len(a) - len(b)) > band:
+        return band + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [band + 1] * len(b)
+        for j in range(max(1, i - band), min(len(b), i + band) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (a[i - 1] != b[j - 1]))
+        previous = current
+    return min(previous[len(b)], band + 1)
+
+
+def similarity(a, b):
+    longest = max(len(a), len(b)) or 1
+    return 1 - char_distance(a, b) / longest
+
+
+def align(expected, actual, band):
+    """토큰(단어 또는 글자) 단위 banded 정렬 → (비용, 차이 목록) - 띠 밖으로 벗어나면 (None, None)"""
+    n, m = len(expected), len(actual)
+    if abs(n - m) > band:
+        return None, None
+    inf = float('inf')
+    cost = [[inf] * (m + 1) for _ in range(n + 1)]
+    cost[0][0] = 0.0
+    for j in range(1, min(m, band) + 1):
+        cost[0][j] = float(j)
+    for i in range(1, n + 1):
+        if i <= band:
+            cost[i][0] = float(i)
+        for j in range(max(1, i - band), min(m, i + band) + 1):
+            e, a = expected[i - 1], actual[j - 1]
+            step = 0.0 if e == a else NEAR_COST if similarity(e, a) >= NEAR_SIMILARITY else 1.0
+            cost[i][j] = min(cost[i - 1][j - 1] + step, cost[i - 1][j] + 1, cost[i][j - 1] + 1)
+
+    # 역추적
+    diff = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0:
+            e, a = expected[i - 1], actual[j - 1]
+            step = 0.0 if e == a else NEAR_COST if similarity(e, a) >= NEAR_SIMILARITY else 1.0
+            if cost[i][j] == cost[i - 1][j - 1] + step:
+                op = 'equal' if step == 0 else 'near' if step == NEAR_COST else 'replace'
+                diff.append({'op': op, 'expected': e, 'actual': a})
+                i, j = i - 1, j - 1
+                continue
+        if i > 0 and cost[i][j] == cost[i - 1][j] + 1:
+            diff.append({'op': 'missing', 'expected': expected[i - 1], 'actual': None})
+            i -= 1
+        else:
+            diff.append({'op': 'extra', 'expected': None, 'actual': actual[j - 1]})
+            j -= 1
+    diff.reverse()
+    return cost[n][m], diff
+
+
+def band_for(length):
+    return max(2, (length * 2 + 4) // 5)  # 약 40%
+
+
+def score_english(expected_tokens, transcript):
+    actual = tokenize(transcript)
+    total, diff = align(expected_tokens, actual, band_for(max(len(expected_tokens), len(actual))))
+    if total is None:
+        return 0.0, [{'op': 'replace', 'expected': ' '.join(expected_tokens), 'actual': ' '.join(actual)}]
+    return max(0.0, 1 - total / max(len(expected_tokens), 1)), diff
+
+
+def score_korean(expected_tokens, transcript):
+    """띄어쓰기를 무시한 글자 단위 정렬 → 점수, 차이는 정답 어절별로 묶어서 표시"""
+    expected_chars = ''.join(expected_tokens)
+    actual_chars = ''.join(tokenize(transcript))
+    total, char_diff = align(list(expected_chars), list(actual_chars), band_for(len(expected_chars)))
+    if total is None:
+        return 0.0, [{'op': 'replace', 'expected': ' '.join(expected_tokens), 'actual': actual_chars}]
+
+    owner = [index for index, token in enumerate(expected_tokens) for _ in token]
+    groups = [{'expected': token, 'actual': '', 'equal': True} for token in expected_tokens]
+    position = current = 0
+    for step in char_diff:
+        if step['expected'] is not None:
+            current = owner[position]
+            position += 1
+        group = groups[current]
+        group['actual'] += step['actual'] or ''
+        group['equal'] = group['equal'] and step['op'] == 'equal'
+    diff = [
+        {'op': 'equal' if g['equal'] else 'replace' if g['actual'] else 'missing',
+         'expected': g['expected'], 'actual': g['actual'] or None}
+        for g in groups
+    ]
+    return max(0.0, 1 - total / max(len(expected_chars), 1)), diff
+
+
+SCORERS = {'en': score_english, 'ko': score_korean}
+
+
+class Grader:
+    """patterns.json 예문 채점 색인 (스레드 안전, mtime 변경 시 자동 재구축)"""
+
+    def __init__(self, data_path, check_interval=1.0):
+        self._source = WatchedJSON(data_path, self._build, check_interval)
+        self._lock = threading.Lock()
+        self._sentences = {}  # id -> {'en': (원문, 토큰), 'ko': (원문, 토큰)}
+        self.graded = 0
+        self.computed = 0
+        self._source.refresh()
+
+    def _build(self, data):
+        sentences = {}
+        for day in data['days']:
+            for pattern in day.get('patterns', []):
+                for index, example in enumerate(pattern.get('examples', [])):
+                    sentences[f"{day['day']}_{pattern['id']}_{index}"] = {
+                        'en': (example['english'], tokenize(example['english'])),
+                        'ko': (example['korean'], tokenize(example['korean'])),
+                    }
+        self._sentences = sentences
+        print(f"📝 채점 색인 구축: 예문 {len(sentences)}개")
+
+    def grade(self, items, threshold=DEFAULT_THRESHOLD):
+        """items: [{id, lang: 'en'|'ko'(답할 언어), alternatives: [...]}] → 문항별 최고 점수 후보"""
+        self._source.refresh()
+        sentences = self._sentences
+        memo = {}  # (id, lang, 정규화된 후보) -> (점수, diff)
+        results = []
+        for item in items:
+            sentence = sentences.get(item['id'])
+            if sentence is None:
+                results.append({'id': item['id'], 'error': 'Unknown id'})
+                continue
+            lang = item['lang']
+            expected, expected_tokens = sentence[lang]
+
+            best = None
+            for alternative in item['alternatives']:
+                key = (item['id'], lang, normalize(alternative))
+                if key not in memo:
+                    memo[key] = SCORERS[lang](expected_tokens, alternative)
+                score, diff = memo[key]
+                if best is None or score > best[0]:
+                    best = (score, diff, alternative)
+                if score == 1.0:
+                    break
+
+            score, diff, transcript = best if best else (0.0, [], '')
+            results.append({
+                'id': item['id'],
+                'correct': score >= threshold,
+                'score': round(score, 3),
+                'transcript': transcript,
+                'expected': expected,
+                'diff': diff,
+            })
+        with self._lock:
+            self.graded += len(items)
+            self.computed += len(memo)
+        return results
+
+    def stats(self):
+        return {'sentences': len(self._sentences), 'graded': self.graded, 'computed': self.computed}
@@ -0,0 +1,124 @@
+"""
+keep-alive 유휴 연결 보관 (PooledHTTPServer)
+- 응답을 마친 keep-alive 연결은 워커에서 빼서 selector 스레드 하나가 지켜봄
+- 다음 요청 바이트(또는 연결 종료)가 도착하면 그때 다시 워커 풀에 넘김 → 유휴 연결이 워커를 차지하지 않음
+- timeout초 동안 조용하면 닫고, 최대 max_idle개까지만 보관 (넘으면 가장 오래된 것부터 닫음)
+"""
+
+import time
+import socket
+import selectors
+import threading
+from collections import OrderedDict
+
+
+class IdleConnections:
+    """유휴 연결 대기실 (스레드 안전 - park()는 어느 스레드에서나, 나머지는 selector 스레드에서)"""
+
+    def __init__(self, on_ready, on_close, timeout=5.0, max_idle=256):
+        self.on_ready = on_ready  # (sock, address) - 요청이 도착한 연결 → 워커 풀로 (selector 스레드에서 부르므로 막히면 안 됨)
+        self.on_close = on_close  # (sock) - 연결 닫기
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._selector = selectors.DefaultSelector()
+        self._idle = OrderedDict()  # sock -> (보관 시작 시각, address), 오래된 순
+        self._pending = []
+        self._lock = threading.Lock()
+        self._closed = False
+        # 다른 스레드에서 select()를 깨우는 용도
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self.parked = 0
+        self.resumed = 0
+        self.expired = 0
+        self.evicted = 0
+        self._thread = threading.Thread(target=self._run, name='kongdan-keepalive', daemon=True)
+        self._thread.start()
+
+    def park(self, sock, address):
+        with self._lock:
+            if not self._closed:
+                self._pending.append((sock, address))
+                self.parked += 1
+                sock = None
+        if sock is not None:
+            self.on_close(sock)
+            return
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\0')
+        except OSError:
+            pass  # 버퍼가 가득 참 = 이미 깨울 예정
+
+    def _drop(self, sock):
+        self._selector.unregister(sock)
+        del self._idle[sock]
+        self.on_close(sock)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    break
+                pending, self._pending = self._pending, []
+            now = time.monotonic()
+            for sock, address in pending:
+                try:
+                    self._selector.register(sock, selectors.EVENT_READ)
+                except (ValueError, OSError):
+                    self.on_close(sock)  # 그 사이 닫힌 소켓
+                    continue
+                self._idle[sock] = (now, address)
+
+            while len(self._idle) > self.max_idle:
+                self._drop(next(iter(self._idle)))
+                self.evicted += 1
+            while self._idle:
+                sock, (since, _) = next(iter(self._idle.items()))
+                if now - since < self.timeout:
+                    break
+                self._drop(sock)
+                self.expired += 1
+
+            wait = self.timeout - (now - next(iter(self._idle.values()))[0]) if self._idle else None
+            for key, _ in self._selector.select(wait):
+                if key.fileobj is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                sock = key.fileobj
+                _, address = self._idle.pop(sock)
+                self._selector.unregister(sock)
+                self.resumed += 1
+                self.on_ready(sock, address)
+
+        for sock in list(self._idle):
+            self._drop(sock)
+        for sock, _ in self._pending:
+            self.on_close(sock)
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def close(self):
+        """보관 중인 연결을 모두 닫고 selector 스레드 종료"""
+        with self._lock:
+            self._closed = True
+        self._wake()
+        self._thread.join()
+
+    def stats(self):
+        return {
+            'idle': len(self._idle),
+            'parked': self.parked,
+            'resumed': self.resumed,
+            'expired': self.expired,
+            'evicted': self.evicted,
+        }
@@ -0,0 +1,227 @@
+"""
+학습 진행 상황 동기화 + 간격 반복(SM-2) 복습 일정
+- 클라이언트는 바뀐 항목(delta)만 묶어서 보내고, 서버는 SQLite(WAL)에 저장
+- 항목 종류: wrong(틀린 문장), bookmark(즐겨찾기), completed(학습 완료), cleared(클리어한 Day)
+- 변경마다 증가하는 version으로 "이 cursor 이후 바뀐 것"만 내려줌 → 다른 기기와 동기화
+  (한 번에 max_changes개까지, 더 있으면 more=True → 받은 cursor로 이어서 요청)
+- wrong 항목은 reviews 테이블의 SM-2 일정으로 관리, (user_id, due) 색인으로 "지금 복습할 N개" 조회
+- DB 파일은 처음 쓸 때 열어서 import만 해서는 만들어지지 않음
+"""
+
+import re
+import json
+import math
+import time
+import sqlite3
+import threading
+
+USER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+KINDS = ('wrong', 'bookmark', 'completed', 'cleared')
+MAX_ITEM_ID = 500
+MAX_DATA_BYTES = 4096
+DAY = 86400
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS items (
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    data TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL,          -- 클라이언트 시각 (나중에 쓴 쪽이 이김)
+    version INTEGER NOT NULL,       -- 서버 변경 순서 (동기화 cursor)
+    PRIMARY KEY (user_id, kind, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_user_version ON items (user_id, version);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    user_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval INTEGER NOT NULL DEFAULT 0,  -- 일
+    reps INTEGER NOT NULL DEFAULT 0,
+    lapses INTEGER NOT NULL DEFAULT 0,
+    due REAL NOT NULL,
+    reviewed REAL,
+    PRIMARY KEY (user_id, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS reviews_user_due ON reviews (user_id, due);
+'''
+
+
+def sm2(ease, interval, reps, grade):
+    """SM-2 한 단계 - grade 0~5 (3 미만은 다시 처음부터) → (ease, interval 일, reps)"""
+    if grade < 3:
+        reps, interval = 0, 1
+    else:
+        reps += 1
+        interval = 1 if reps == 1 else 6 if reps == 2 else round(interval * ease)
+    ease = max(1.3, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return ease, interval, reps
+
+
+class ProgressError(ValueError):
+    """잘못된 동기화 요청 (400으로 응답)"""
+
+
+class ProgressStore:
+    """진행 상황 저장소 (스레드 안전 - 연결 하나를 락으로 보호)"""
+
+    def __init__(self, db_path, max_ops=500, max_changes=1000):
+        self.db_path = db_path
+        self.max_ops = max_ops
+        self.max_changes = max_changes
+        self._lock = threading.Lock()
+        self._db = None
+        self._version = 0
+        self.batches = 0
+        self.ops = 0
+
+    def _connect(self):
+        """락 안에서 호출 - 처음 한 번만 DB를 열고 스키마 준비"""
+        if self._db is None:
+            db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')  # WAL에서는 체크포인트 때만 fsync해도 안전
+            db.executescript(SCHEMA)
+            self._version = db.execute('SELECT COALESCE(MAX(version), 0) FROM items').fetchone()[0]
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def is_valid_user(user_id):
+        return isinstance(user_id, str) and bool(USER_ID_PATTERN.match(user_id))
+
+    def _check_op(self, op):
+        if not isinstance(op, dict):
+            raise ProgressError('op must be an object')
+        kind = op.get('kind')
+        item_id = op.get('id')
+        if op.get('op') != 'review' and kind not in KINDS:
+            raise ProgressError(f'Unknown kind: {kind}')
+        if not isinstance(item_id, str) or not item_id or len(item_id) > MAX_ITEM_ID:
+            raise ProgressError('Invalid id')
+        ts = op.get('ts')
+        if ts is not None and (not isinstance(ts, (int, float)) or isinstance(ts, bool) or not math.isfinite(ts)):
+            raise ProgressError('Invalid ts')
+        if op.get('op') == 'put':
+            data = json.dumps(op.get('data'), ensure_ascii=False)
+            if len(data.encode('utf-8')) > MAX_DATA_BYTES:
+                raise ProgressError('data too large')
+            return data
+        if op.get('op') == 'review':
+            grade = op.get('grade')
+            if not isinstance(grade, int) or isinstance(grade, bool) or not 0 <= grade <= 5:
+                raise ProgressError('grade must be 0-5')
+        elif op.get('op') != 'delete':
+            raise ProgressError(f"Unknown op: {op.get('op')}")
+        return None
+
+    def sync(self, user_id, ops, since=0):
+        """ops 적용 후 since 이후 바뀐 항목(최대 max_changes개)과 새 cursor 반환 - 한 트랜잭션"""
+        if len(ops) > self.max_ops:
+            raise ProgressError(f'Too many ops (max {self.max_ops})')
+        checked = [(op, self._check_op(op)) for op in ops]
+        now = time.time()
+
+        with self._lock, self._connect():
+            for op, data in checked:
+                ts = op.get('ts') if op.get('ts') is not None else now * 1000
+                if op['op'] == 'review':
+                    self._review(user_id, op['id'], op['grade'], now)
+                else:
+                    self._write(user_id, op['kind'], op['id'], data, op['op'] == 'delete', ts, now)
+            changes = self._db.execute(
+                'SELECT kind, item_id, data, deleted, version FROM items '
+                'WHERE user_id = ? AND version > ? ORDER BY version LIMIT ?',
+                (user_id, since, self.max_changes + 1)
+            ).fetchall()
+            self.batches += 1
+            self.ops += len(ops)
+
+        more = len(changes) > self.max_changes
+        changes = changes[:self.max_changes]
+        return {
+            'applied': len(ops),
+            'cursor': changes[-1][4] if changes else since,
+            'more': more,
+            'changes': [
+                {'kind': kind, 'id': item_id, 'deleted': bool(deleted),
+                 'data': json.loads(data) if data and not deleted else None}
+                for kind, item_id, data, deleted, _ in changes
+            ],
+        }
+
+    def _write(self, user_id, kind, item_id, data, deleted, ts, now):
+        row = self._db.execute(
+            'SELECT updated FROM items WHERE user_id = ? AND kind = ? AND item_id = ?',
+            (user_id, kind, item_id)
+        ).fetchone()
+        if row and row[0] > ts:
+            return  # 다른 기기에서 더 나중에 바꾼 값이 이미 있음
+        self._version += 1
+        self._db.execute(
+            'INSERT OR REPLACE INTO items (user_id, kind, item_id, data, deleted, updated, version) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (user_id, kind, item_id, None if deleted else data, int(deleted), ts, self._version)
+        )
+        if kind == 'wrong':
+            if deleted:
+                self._db.execute('DELETE FROM reviews WHERE user_id = ? AND item_id = ?', (user_id, item_id))
+            else:
+                # 새로 틀린 문장은 바로 복습 대상 (이미 일정이 있으면 유지)
+                self._db.execute(
+                    'INSERT OR IGNORE INTO reviews (user_id, item_id, due) VALUES (?, ?, ?)',
+                    (user_id, item_id, now)
+                )
+
+    def _review(self, user_id, item_id, grade, now):
+        wrong = self._db.execute(
+            "SELECT 1 FROM items WHERE user_id = ? AND kind = 'wrong' AND item_id = ? AND deleted = 0",
+            (user_id, item_id)
+        ).fetchone()
+        if wrong is None:
+            return  # 틀린 문장 목록에 없는 항목 - 복습 일정을 만들면 내용 없는 복습 대상이 생김
+        row = self._db.execute(
+            'SELECT ease, interval, reps FROM reviews WHERE user_id = ? AND item_id = ?',
+            (user_id, item_id)
+        ).fetchone()
+        ease, interval, reps = sm2(*(row or (2.5, 0, 0)), grade)
+        self._db.execute(
+            'INSERT INTO reviews (user_id, item_id, ease, interval, reps, lapses, due, reviewed) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (user_id, item_id) DO UPDATE SET ease = excluded.ease, interval = excluded.interval, '
+            'reps = excluded.reps, lapses = lapses + excluded.lapses, due = excluded.due, reviewed = excluded.reviewed',
+            (user_id, item_id, ease, interval, reps, int(grade < 3), now + interval * DAY, now)
+        )
+
+    def due(self, user_id, limit=20, now=None):
+        """(지금 복습할 항목 limit개 - 오래 밀린 순, 전체 밀린 수) - reviews_user_due 색인 범위 조회"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._connect()
+            rows = self._db.execute(
+                'SELECT r.item_id, r.ease, r.interval, r.reps, r.lapses, r.due, i.data '
+                'FROM reviews r JOIN items i ON i.user_id = r.user_id AND i.kind = \'wrong\' AND i.item_id = r.item_id '
+                'WHERE r.user_id = ? AND r.due <= ? ORDER BY r.due LIMIT ?',
+                (user_id, now, limit)
+            ).fetchall()
+            total = self._db.execute(
+                'SELECT COUNT(*) FROM reviews r JOIN items i ON i.user_id = r.user_id AND i.kind = \'wrong\' '
+                'AND i.item_id = r.item_id WHERE r.user_id = ? AND r.due <= ?', (user_id, now)
+            ).fetchone()[0]
+        items = [
+            {'id': item_id, 'ease': round(ease, 2), 'interval': interval, 'reps': reps,
+             'lapses': lapses, 'due': due, 'data': json.loads(data) if data else None}
+            for item_id, ease, interval, reps, lapses, due, data in rows
+        ]
+        return items, total
+
+    def stats(self):
+        return {'batches': self.batches, 'ops': self.ops, 'version': self._version}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
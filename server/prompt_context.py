@@ -0,0 +1,223 @@
+"""
+챗봇 프롬프트 컨텍스트 캐시
+- 시스템 프롬프트 + 전체 커리큘럼(Day별 패턴/예문/주요 단어)을 한 번만 만들어 모델 제공자에 캐시 콘텐츠로 등록
+  (Day 하나는 1,000토큰 안팎이라 제공자의 최소 캐시 크기에 못 미침 → 전체를 묶어서 하나로 등록)
+- 채팅 요청은 캐시 이름(cached_content)만 참조하고, 학생이 보고 있는 Day는 짧은 안내문(day note)으로 알려줌
+  → 시스템 프롬프트까지 캐시되므로 매 턴 보내는 (캐시 안 된) 입력 토큰이 기본 프롬프트만 보낼 때보다 줄어듦
+- TTL 만료 전이나 patterns.json 내용이 바뀌면 다시 등록
+- 제공자의 최소 캐시 크기보다 작거나 등록에 실패하면 Day 내용 없이 기본 프롬프트만 system_instruction으로 보냄
+  (캐시 없이 커리큘럼을 매번 보내지는 않음)
+
+제공자 인터페이스 (GeminiContextProvider / StubContextProvider):
+    min_tokens                        -> 캐시할 수 있는 최소 토큰 수 (0이면 확인 안 함)
+    count_tokens(system_prompt)       -> 토큰 수
+    create(system_prompt, ttl, label) -> handle
+    config(handle, system_prompt)     -> GenerateContentConfig에 넣을 kwargs
+    delete(handle)
+"""
+
+import math
+import time
+import hashlib
+import threading
+
+from watched_json import WatchedJSON
+
+RETRY_AFTER_FAILURE = 300  # 등록 실패 후 다시 시도하기까지 (초)
+
+
+def build_day_context(day):
+    """Day 데이터 → 커리큘럼에 넣을 학습 내용 텍스트"""
+    lines = [f"[Day {day['day']} - {day.get('title', '')}]"]
+    for pattern in day.get('patterns', []):
+        lines.append(f"\n패턴: {pattern['title']} - {pattern.get('description', '')}")
+        for example in pattern.get('examples', []):
+            lines.append(f"- {example['english']} ({example['korean']})")
+    # 같은 단어는 한 번만, 뜻이 아직 없는 자리표시("단어 뜻 확인하기")는 빼고
+    vocabulary = {}
+    for v in day.get('vocabulary', []):
+        meaning = v.get('meaning', '')
+        vocabulary.setdefault(v['word'], '' if '확인' in meaning else meaning)
+    if vocabulary:
+        lines.append('\n주요 단어: ' + ', '.join(f"{w}({m})" if m else w for w, m in vocabulary.items()))
+    return '\n'.join(lines)
+
+
+def build_curriculum_prompt(base_prompt, days):
+    """기본 프롬프트 + 전체 커리큘럼 - 캐시 콘텐츠로 등록하는 시스템 프롬프트"""
+    blocks = '\n\n'.join(build_day_context(day) for day in days)
+    return f"{base_prompt}\n\n[커리큘럼 - 학생이 공부하는 Day별 패턴, 예문, 주요 단어]\n\n{blocks}"
+
+
+def build_day_note(day):
+    """요청마다 붙이는 짧은 안내문 - 학생이 지금 보고 있는 Day"""
+    return (f"[학생이 지금 공부하는 내용: Day {day['day']} - {day.get('title', '')}. "
+            f"질문이 이 Day 내용과 관련 있으면 커리큘럼의 Day {day['day']} 예문을 활용해서 답해.]")
+
+
+class GeminiContextProvider:
+    """Gemini 명시적 컨텍스트 캐시 (client.caches)"""
+
+    def __init__(self, client, model, types, min_tokens=0):
+        self.client = client
+        self.model = model
+        self.types = types
+        self.min_tokens = min_tokens
+
+    def count_tokens(self, system_prompt):
+        return self.client.models.count_tokens(model=self.model, contents=system_prompt).total_tokens
+
+    def create(self, system_prompt, ttl, label):
+        cached = self.client.caches.create(
+            model=self.model,
+            config=self.types.CreateCachedContentConfig(
+                system_instruction=system_prompt,
+                display_name=label,
+                ttl=f'{int(ttl)}s'
+            )
+        )
+        return cached.name
+
+    def config(self, handle, system_prompt):
+        return {'cached_content': handle}
+
+    def delete(self, handle):
+        self.client.caches.delete(name=handle)
+
+
+class StubContextProvider:
+    """로컬 개발/테스트용 - 등록은 메모리에만 하고 요청에는 프롬프트를 그대로 넣음"""
+
+    min_tokens = 0
+
+    def __init__(self):
+        self.created = {}
+        self._count = 0
+
+    def count_tokens(self, system_prompt):
+        return len(system_prompt) // 4
+
+    def create(self, system_prompt, ttl, label):
+        self._count += 1
+        handle = f'stub/{label}/{self._count}'
+        self.created[handle] = system_prompt
+        return handle
+
+    def config(self, handle, system_prompt):
+        return {'system_instruction': self.created.get(handle, system_prompt)}
+
+    def delete(self, handle):
+        self.created.pop(handle, None)
+
+
+class PromptContextCache:
+    """커리큘럼 캐시 콘텐츠 관리 (스레드 안전)
+
+    provider가 None이면 캐시 없이 항상 기본 프롬프트만 system_instruction으로 보낸다.
+    """
+
+    def __init__(self, data_path, base_prompt, provider=None, ttl=3600, refresh_margin=60, check_interval=5.0):
+        self._source = WatchedJSON(data_path, self._build, check_interval)
+        self.base_prompt = base_prompt
+        self.provider = provider
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._create_lock = threading.Lock()
+        self._curriculum = None  # 기본 프롬프트 + 전체 커리큘럼
+        self._digest = None
+        self._notes = {}         # day -> Day 안내문
+        self._entry = None       # {'handle', 'digest', 'expires'} 또는 {'failed_until', 'digest'}
+        self.created = 0
+        self.hits = 0
+        self.fallbacks = 0
+        self.too_small = 0
+
+    def _build(self, data):
+        # 프롬프트 텍스트만 교체 - 등록된 캐시는 digest가 달라졌을 때 context()에서 다시 만듦
+        days = [day for day in data['days'] if day.get('patterns')]
+        curriculum = build_curriculum_prompt(self.base_prompt, days)
+        self._curriculum, self._digest = curriculum, hashlib.sha256(curriculum.encode('utf-8')).hexdigest()
+        self._notes = {day['day']: build_day_note(day) for day in days}
+
+    def prompt_key(self, day=None):
+        """응답 캐시 키에 넣을 프롬프트 식별 문자열 - 커리큘럼이나 Day가 바뀌면 달라짐"""
+        self._source.refresh()
+        if day not in self._notes:
+            return self.base_prompt
+        return f"{self._digest}:{self._notes[day]}"
+
+    def fallback(self):
+        """캐시를 못 쓸 때의 GenerateContentConfig kwargs - 기본 프롬프트만"""
+        return {'system_instruction': self.base_prompt}
+
+    def context(self, day=None):
+        """(GenerateContentConfig kwargs, Day 안내문 또는 None)
+
+        커리큘럼 캐시를 참조할 수 있을 때만 Day 안내문을 준다 (없으면 기본 프롬프트만).
+        """
+        self._source.refresh()
+        note = self._notes.get(day)
+        if self.provider is None or note is None:
+            return self.fallback(), None
+        curriculum, digest = self._curriculum, self._digest
+
+        # 같은 내용을 동시에 여러 번 등록하지 않도록
+        with self._create_lock:
+            now = time.time()
+            entry = self._entry
+            if entry and entry['digest'] == digest:
+                if entry.get('handle') and now < entry['expires'] - self.refresh_margin:
+                    self.hits += 1
+                    return self.provider.config(entry['handle'], curriculum), note
+                if not entry.get('handle') and now < entry['failed_until']:
+                    self.fallbacks += 1
+                    return self.fallback(), None
+
+            if entry and entry.get('handle'):
+                self._delete(entry['handle'])
+            try:
+                tokens = self.provider.count_tokens(curriculum) if self.provider.min_tokens else None
+                if tokens is not None and tokens < self.provider.min_tokens:
+                    # 등록해도 거절됨 - 내용(digest)이 바뀔 때까지 다시 시도하지 않음
+                    print(f"ℹ️ 커리큘럼 프롬프트가 캐시 최소 크기보다 작음 ({tokens} < {self.provider.min_tokens} 토큰) - 기본 프롬프트만 전송")
+                    self._set_entry({'digest': digest, 'failed_until': math.inf})
+                    self.too_small += 1
+                    self.fallbacks += 1
+                    return self.fallback(), None
+                handle = self.provider.create(curriculum, self.ttl, 'kongdan-curriculum')
+            except Exception as e:
+                print(f"⚠️ 프롬프트 캐시 등록 실패: {e}")
+                self._set_entry({'digest': digest, 'failed_until': now + RETRY_AFTER_FAILURE})
+                self.fallbacks += 1
+                return self.fallback(), None
+            self._set_entry({'handle': handle, 'digest': digest, 'expires': now + self.ttl})
+            self.created += 1
+            return self.provider.config(handle, curriculum), note
+
+    def _set_entry(self, entry):
+        with self._lock:
+            self._entry = entry
+
+    def invalidate(self):
+        """캐시가 제공자 쪽에서 사라졌을 때 (만료/삭제) 다음 요청에서 다시 등록"""
+        with self._lock:
+            entry, self._entry = self._entry, None
+        if entry and entry.get('handle'):
+            self._delete(entry['handle'])
+
+    def _delete(self, handle):
+        try:
+            self.provider.delete(handle)
+        except Exception as e:
+            print(f"⚠️ 프롬프트 캐시 삭제 실패 ({handle}): {e}")
+
+    def close(self):
+        """등록한 캐시 정리 (서버 종료 시) - 남겨둬도 TTL이 지나면 제공자가 지움"""
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            active = 1 if self._entry and self._entry.get('handle') else 0
+        return {'active': active, 'created': self.created, 'hits': self.hits, 'fallbacks': self.fallbacks,
+                'too_small': self.too_small}
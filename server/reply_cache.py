@@ -0,0 +1,118 @@
+"""
+챗봇 응답 캐시
+- 1단계: 메모리 LRU (TTL + 개수 제한)
+- 2단계(선택): SQLite 디스크 캐시 - 서버를 재시작해도 유지
+"""
+
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_message(message):
+    """캐시 키용 메시지 정규화 - 대소문자/공백/끝 문장부호 차이 무시"""
+    text = unicodedata.normalize('NFC', message).lower()
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text.rstrip('?!.~ ')
+
+
+def history_digest(history):
+    """대화 기록 요약 해시 (role은 user/model 두 가지로 통일)"""
+    turns = [
+        ['user' if h.get('role') == 'user' else 'model', h.get('text', '')]
+        for h in history
+    ]
+    raw = json.dumps(turns, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def make_cache_key(message, history, model, system_prompt):
+    """정규화된 메시지 + 대화 기록 + 모델 + 시스템 프롬프트 해시로 만든 캐시 키"""
+    prompt_hash = hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()
+    raw = '\n'.join([model, prompt_hash, history_digest(history), normalize_message(message)])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ReplyCache:
+    """메모리 LRU + 선택적 SQLite 2단계 응답 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries=1000, ttl=86400, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> (reply, 저장 시각)
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, reply TEXT NOT NULL, created REAL NOT NULL)'
+            )
+            self._db.execute('DELETE FROM replies WHERE created < ?', (time.time() - ttl,))
+            self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+            if self._db:
+                row = self._db.execute(
+                    'SELECT reply, created FROM replies WHERE key = ? AND created >= ?',
+                    (key, now - self.ttl)
+                ).fetchone()
+                if row:
+                    self._store_memory(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, reply):
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, reply, now)
+            if self._db:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO replies (key, reply, created) VALUES (?, ?, ?)',
+                    (key, reply, now)
+                )
+                self._db.commit()
+
+    def _store_memory(self, key, reply, created):
+        self._memory[key] = (reply, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'size': len(self._memory)
+            }
+
+    def close(self):
+        if self._db:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,157 @@
+"""
+커리큘럼 검색 - patterns.json 역색인
+- 영어: 단어 토큰 (update_vocab_meanings.normalize_word + 변화형 역색인으로 기본형 통일)
+- 한글: 글자 bigram (조사/어미가 붙어도 부분 일치)
+- 파일 mtime이 바뀌면 다음 검색 때 다시 색인
+- 용어마다 가중 빈도가 높은 문서 CHAMPION_LIST_SIZE개(champion list)만 후보로 씀
+  → "I", "to"처럼 대부분 문서에 나오는 단어가 있어도 검색 비용이 데이터 크기와 무관
+"""
+
+import re
+import math
+import heapq
+from collections import defaultdict
+
+from update_vocab_meanings import normalize_word, inflection_index
+from watched_json import WatchedJSON
+
+ENGLISH_TOKEN = re.compile(r"[a-z][a-z'\-]*")
+HANGUL_RUN = re.compile(r'[가-힣]+')
+
+# 필드별 가중치 - 패턴 제목/단어 자체에 걸리면 예문 본문보다 높게
+FIELD_WEIGHTS = {'title': 3.0, 'word': 3.0, 'description': 2.0, 'meaning': 2.0, 'english': 1.0, 'korean': 1.0}
+DOC_TYPES = ('pattern', 'example', 'vocabulary')
+CHAMPION_LIST_SIZE = 200  # 용어(와 문서 종류)별 후보 수 - 이보다 드문 용어는 모든 문서가 후보
+
+
+def english_terms(text):
+    lemmas = inflection_index()
+    terms = []
+    for token in ENGLISH_TOKEN.findall(text.lower()):
+        word = normalize_word(token).strip("'-")
+        if not word:
+            continue
+        match = lemmas.lookup(word)
+        terms.append('en:' + (match[0] if match else word))
+    return terms
+
+
+def korean_terms(text):
+    terms = []
+    for run in HANGUL_RUN.findall(text):
+        if len(run) == 1:
+            terms.append('ko:' + run)
+        else:
+            terms.extend('ko:' + run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def text_terms(text):
+    return english_terms(text) + korean_terms(text)
+
+
+def build_documents(data):
+    """검색 대상 문서 목록 - 패턴, 예문, 주요 단어"""
+    docs = []
+    for day in data['days']:
+        for pattern in day.get('patterns', []):
+            docs.append({
+                'type': 'pattern', 'day': day['day'], 'pattern_id': pattern['id'],
+                'fields': {'title': pattern.get('title', ''), 'description': pattern.get('description', '')},
+            })
+            for index, example in enumerate(pattern.get('examples', [])):
+                docs.append({
+                    'type': 'example', 'day': day['day'], 'pattern_id': pattern['id'], 'index': index,
+                    'pattern_title': pattern.get('title', ''),
+                    'fields': {'english': example.get('english', ''), 'korean': example.get('korean', '')},
+                })
+        for vocab in day.get('vocabulary', []):
+            docs.append({
+                'type': 'vocabulary', 'day': day['day'],
+                'fields': {'word': vocab.get('word', ''), 'meaning': vocab.get('meaning', ''),
+                           'english': vocab.get('example', '')},
+            })
+    return docs
+
+
+class SearchIndex:
+    """patterns.json 역색인 (스레드 안전, mtime 변경 시 자동 재색인)"""
+
+    def __init__(self, data_path, check_interval=1.0):
+        self._source = WatchedJSON(data_path, self._build, check_interval)
+        self._docs = []
+        self._postings = {}   # term -> {doc_id: 가중 빈도}
+        self._idf = {}
+        self._champions = {}  # term -> {doc_type 또는 None: 가중 빈도 높은 순 doc_id 목록}
+        self._counts = {}     # term -> {doc_type 또는 None: 문서 수}
+        self._source.refresh()
+
+    def _build(self, data):
+        docs = build_documents(data)
+        postings = defaultdict(dict)
+        for doc_id, doc in enumerate(docs):
+            for field, text in doc['fields'].items():
+                weight = FIELD_WEIGHTS[field]
+                for term in text_terms(text):
+                    postings[term][doc_id] = postings[term].get(doc_id, 0.0) + weight
+
+        total = len(docs)
+        idf = {term: math.log(1 + total / len(hits)) for term, hits in postings.items()}
+
+        champions = {}
+        counts = {}
+        for term, hits in postings.items():
+            ranked = sorted(hits, key=lambda d: (-hits[d], d))
+            champions[term] = {None: ranked[:CHAMPION_LIST_SIZE]}
+            counts[term] = {None: len(ranked)}
+            for doc_type in DOC_TYPES:
+                typed = [d for d in ranked if docs[d]['type'] == doc_type]
+                champions[term][doc_type] = typed[:CHAMPION_LIST_SIZE]
+                counts[term][doc_type] = len(typed)
+
+        # 새 색인을 다 만든 뒤 한 번에 교체 → 검색 중인 스레드는 이전 색인을 끝까지 사용
+        self._docs, self._postings, self._idf = docs, dict(postings), idf
+        self._champions, self._counts = champions, counts
+        print(f"🔎 검색 색인 구축: 문서 {total}개, 용어 {len(idf)}개")
+
+    def search(self, query, limit=20, doc_type=None):
+        """(결과 목록, 전체 일치 수) - 쿼리 용어를 더 많이 포함한 문서가 먼저, 그다음 TF-IDF 점수순
+
+        후보는 용어별 champion list의 합집합이고, 점수는 후보마다 모든 용어로 계산한다.
+        champion list가 잘린 흔한 용어가 있으면 전체 일치 수는 추정치(가장 흔한 용어의 문서 수)다.
+        """
+        self._source.refresh()
+        docs, postings, idf = self._docs, self._postings, self._idf
+        champions, counts = self._champions, self._counts
+
+        terms = [t for t in dict.fromkeys(text_terms(query)) if t in postings]
+        candidates = set()
+        truncated = False
+        for term in terms:
+            candidates.update(champions[term][doc_type])
+            truncated = truncated or counts[term][doc_type] > CHAMPION_LIST_SIZE
+
+        ranks = {}
+        for doc_id in candidates:
+            matched = 0
+            score = 0.0
+            for term in terms:
+                tf = postings[term].get(doc_id)
+                if tf:
+                    matched += 1
+                    score += tf * idf[term]
+            ranks[doc_id] = (matched, score)
+
+        results = []
+        for doc_id in heapq.nlargest(limit, ranks, key=ranks.get):
+            doc = docs[doc_id]
+            result = {k: v for k, v in doc.items() if k != 'fields'}
+            result.update(doc['fields'])
+            result['score'] = round(ranks[doc_id][1], 3)
+            result['matched_terms'] = ranks[doc_id][0]
+            results.append(result)
+        total = max(counts[t][doc_type] for t in terms) if truncated else len(candidates)
+        return results, total
+
+    def stats(self):
+        return {'documents': len(self._docs), 'terms': len(self._idf)}
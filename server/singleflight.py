@@ -0,0 +1,72 @@
+"""
+동일 요청 합치기 (singleflight)
+- 같은 키로 동시에 들어온 요청은 첫 요청(leader)의 호출 하나만 실행하고 결과/예외를 나눠 가짐
+- 뒤따르는 요청(follower)은 최대 wait초까지 기다리고, 넘기면 직접 호출 (wait <= 0이면 끔)
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중 호출 공유 (스레드 안전)"""
+
+    def __init__(self, wait=30.0):
+        self.wait = wait
+        self._calls = {}  # key -> _Call
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0     # follower가 결과를 나눠 받은 수 = 아낀 호출 수
+        self.timeouts = 0   # 기다리다 포기하고 직접 호출한 수
+
+    def do(self, key, fn):
+        """(결과, 공유 여부) - fn이 예외를 던지면 기다리던 요청 모두 같은 예외를 받음"""
+        if self.wait <= 0:  # 합치기 끔
+            return fn(), False
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result, False
+
+        if not call.done.wait(self.wait):
+            with self._lock:
+                self.timeouts += 1
+            return fn(), False
+        with self._lock:
+            self.shared += 1
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'leaders': self.leaders,
+                'shared': self.shared,
+                'timeouts': self.timeouts,
+            }
@@ -0,0 +1,190 @@
+"""
+docs/ 정적 파일 제공 (backend.py --static)
+- 강한 ETag (내용 SHA-256) + If-None-Match → 304
+- 미리 압축한 사이드카(data.js.br / data.js.gz)가 있으면 그대로 보내고,
+  없으면 즉석 압축 결과를 메모리 LRU에 보관
+- 해시 이름인 audio/*.wav만 immutable, 나머지는 매번 ETag로 재검증 (no-cache)
+
+사이드카 만들기 (배포 전 한 번):
+    python static_files.py ../docs
+"""
+
+import os
+import re
+import hashlib
+import argparse
+import mimetypes
+import threading
+from pathlib import Path
+from urllib.parse import unquote
+from collections import OrderedDict
+
+from compression import SUPPORTED_ENCODINGS, SIDECAR_SUFFIX, is_compressible, negotiate, compress, brotli
+
+DEFAULT_COMPRESS_MIN = 1024  # 이보다 작은 파일은 압축 이득보다 비용이 큼
+# 이름이 내용 해시인 파일만 immutable (audio/manifest.json 등은 다시 만들어지므로 제외)
+IMMUTABLE_PATH = re.compile(r'^audio/[0-9a-f]{64}\.wav$')
+
+CONTENT_TYPES = {
+    '.js': 'text/javascript; charset=utf-8',
+    '.json': 'application/json',
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.wav': 'audio/wav',
+}
+
+
+def content_type_for(path):
+    return CONTENT_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+
+
+class StaticFiles:
+    """정적 파일 조회 (스레드 안전)"""
+
+    def __init__(self, root, compress_min=DEFAULT_COMPRESS_MIN, memory_bytes=16 * 1024 * 1024):
+        self.root = Path(root).resolve()
+        self.compress_min = compress_min
+        self.memory_bytes = memory_bytes
+        self._lock = threading.Lock()
+        self._digests = {}              # path -> (mtime_ns, size, sha256 앞 32자)
+        self._compressed = OrderedDict()  # (path, mtime_ns, encoding) -> bytes
+        self._compressed_bytes = 0
+        self.sidecar_hits = 0
+        self.memory_hits = 0
+        self.compressions = 0
+
+    def resolve(self, url_path):
+        """URL 경로 → root 안의 파일 경로, 없거나 root 밖/숨김 파일이면 None"""
+        rel = unquote(url_path).lstrip('/')
+        if any(part.startswith('.') for part in Path(rel).parts):
+            return None
+        path = (self.root / rel).resolve()
+        if not path.is_relative_to(self.root):
+            return None
+        if path.is_dir():
+            path = path / 'index.html'
+        return path if path.is_file() else None
+
+    def _digest(self, path, stat):
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:32]
+        with self._lock:
+            self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _sidecars(self, path, stat):
+        """원본보다 새로운 사이드카만 {인코딩: 경로}"""
+        found = {}
+        for encoding, suffix in SIDECAR_SUFFIX.items():
+            sidecar = path.with_name(path.name + suffix)
+            try:
+                if sidecar.stat().st_mtime_ns >= stat.st_mtime_ns:
+                    found[encoding] = sidecar
+            except FileNotFoundError:
+                pass
+        return found
+
+    def _compressed_body(self, path, stat, encoding):
+        key = (path, stat.st_mtime_ns, encoding)
+        with self._lock:
+            body = self._compressed.get(key)
+            if body is not None:
+                self._compressed.move_to_end(key)
+                self.memory_hits += 1
+                return body
+        body = compress(path.read_bytes(), encoding)
+        with self._lock:
+            self.compressions += 1
+            if key not in self._compressed and len(body) <= self.memory_bytes:
+                self._compressed[key] = body
+                self._compressed_bytes += len(body)
+                while self._compressed_bytes > self.memory_bytes:
+                    _, evicted = self._compressed.popitem(last=False)
+                    self._compressed_bytes -= len(evicted)
+        return body
+
+    def get(self, url_path, accept_encoding=''):
+        """응답 정보 dict (body, etag, content_type, encoding, cache_control, vary) 또는 None"""
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        stat = path.stat()
+        digest = self._digest(path, stat)
+        content_type = content_type_for(path)
+        compressible = is_compressible(content_type) and stat.st_size >= self.compress_min
+
+        body = None
+        encoding = None
+        if compressible:
+            sidecars = self._sidecars(path, stat)
+            available = [e for e in ('br', 'gzip') if e in sidecars or e in SUPPORTED_ENCODINGS]
+            encoding = negotiate(accept_encoding, available)
+            if encoding in sidecars:
+                body = sidecars[encoding].read_bytes()
+                with self._lock:
+                    self.sidecar_hits += 1
+            elif encoding:
+                body = self._compressed_body(path, stat, encoding)
+        if body is None:
+            body = path.read_bytes()
+
+        rel = path.relative_to(self.root).as_posix()
+        immutable = bool(IMMUTABLE_PATH.match(rel))
+        return {
+            'body': body,
+            # 인코딩마다 바이트가 다르므로 ETag도 구분 (강한 ETag)
+            'etag': f'"{digest}-{encoding}"' if encoding else f'"{digest}"',
+            'content_type': content_type,
+            'encoding': encoding,
+            'cache_control': 'public, max-age=31536000, immutable' if immutable else 'no-cache',
+            'vary': compressible,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sidecar_hits': self.sidecar_hits,
+                'memory_hits': self.memory_hits,
+                'compressions': self.compressions,
+                'memory_items': len(self._compressed),
+                'memory_bytes': self._compressed_bytes,
+            }
+
+
+def precompress(root, min_bytes=DEFAULT_COMPRESS_MIN):
+    """압축할 만한 파일마다 .gz (brotli가 있으면 .br도) 사이드카 생성 - 원본보다 작을 때만"""
+    encodings = ['gzip'] + (['br'] if brotli else [])
+    suffixes = tuple(SIDECAR_SUFFIX.values())
+    written = skipped = 0
+    for path in sorted(Path(root).rglob('*')):
+        if not path.is_file() or path.name.endswith(suffixes) or path.name.startswith('.'):
+            continue
+        stat = path.stat()
+        if stat.st_size < min_bytes or not is_compressible(content_type_for(path)):
+            continue
+        data = None
+        for encoding in encodings:
+            sidecar = path.with_name(path.name + SIDECAR_SUFFIX[encoding])
+            if sidecar.exists() and sidecar.stat().st_mtime_ns >= stat.st_mtime_ns:
+                skipped += 1
+                continue
+            data = data if data is not None else path.read_bytes()
+            body = compress(data, encoding, best=True)
+            if len(body) >= len(data):
+                continue
+            sidecar.write_bytes(body)
+            os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # 원본과 같은 mtime → 최신 여부 판단
+            written += 1
+            print(f"🗜️ {sidecar} ({len(data)} → {len(body)} bytes)")
+    print(f"✅ 사이드카 {written}개 생성, {skipped}개는 이미 최신")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='정적 파일 사이드카(.gz/.br) 미리 압축')
+    parser.add_argument('root', type=Path, nargs='?', default=Path(__file__).parent.parent / 'docs')
+    parser.add_argument('--min-bytes', type=int, default=DEFAULT_COMPRESS_MIN)
+    args = parser.parse_args()
+    precompress(args.root, args.min_bytes)
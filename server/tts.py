@@ -0,0 +1,207 @@
+"""
+TTS - Vertex AI Gemini 2.5 Native TTS + 오디오 캐시
+- 캐시 키: (텍스트, 음성, 언어, 속도) 해시 → 같은 문장은 한 번만 합성
+- 1단계: 메모리 LRU (바이트 용량 제한)
+- 2단계: 디스크 디렉터리 (<키>.wav, 용량 제한 - 넘으면 가장 오래 안 쓴 파일부터 삭제)
+"""
+
+import io
+import os
+import re
+import wave
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+TTS_MODEL = "gemini-2.5-flash-preview-tts"
+TTS_SAMPLE_RATE = 24000  # Gemini TTS 출력: 24kHz 16bit mono PCM
+
+DEFAULT_VOICES = {'en': 'Kore', 'ko': 'Aoede'}
+VOICE_PATTERN = re.compile(r'^[A-Za-z]{2,32}$')
+
+# 속도는 자연어 지시로 전달 (Gemini TTS에는 speakingRate 옵션이 없음)
+SPEED_PROMPTS = [
+    (0.8, "Read this very slowly and clearly, for a language learner: "),
+    (0.95, "Read this slowly and clearly: "),
+    (1.1, ""),
+    (float('inf'), "Read this quickly: "),
+]
+
+
+def audio_key(text, voice, lang, speed):
+    """캐시 키 - 프런트엔드 사전 렌더링 manifest와 같은 규칙"""
+    raw = f"{lang}|{voice}|{speed:.2f}|{text}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def resolve_voice(lang, voice=None):
+    return voice or DEFAULT_VOICES.get(lang, DEFAULT_VOICES['en'])
+
+
+def pcm_to_wav(pcm, rate=TTS_SAMPLE_RATE):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def wav_duration(data):
+    """WAV 재생 시간 (초)"""
+    with wave.open(io.BytesIO(data), 'rb') as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+class GeminiSynthesizer:
+    """Gemini Native TTS 호출 → WAV 바이트"""
+
+    def __init__(self, client, model=TTS_MODEL):
+        self.client = client
+        self.model = model
+
+    def synthesize(self, text, voice, lang, speed):
+        from google.genai import types
+
+        prefix = next(prompt for limit, prompt in SPEED_PROMPTS if speed < limit)
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=prefix + text,
+            config=types.GenerateContentConfig(
+                response_modalities=["AUDIO"],
+                speech_config=types.SpeechConfig(
+                    voice_config=types.VoiceConfig(
+                        prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice)
+                    )
+                )
+            )
+        )
+
+        part = response.candidates[0].content.parts[0]
+        if not part.inline_data or not part.inline_data.data:
+            raise RuntimeError('TTS 응답에 오디오가 없습니다')
+
+        # mime_type 예: audio/L16;codec=pcm;rate=24000
+        match = re.search(r'rate=(\d+)', part.inline_data.mime_type or '')
+        rate = int(match.group(1)) if match else TTS_SAMPLE_RATE
+        return pcm_to_wav(part.inline_data.data, rate)
+
+
+class AudioCache:
+    """메모리 LRU + 디스크 LRU 2단계 오디오 캐시 (스레드 안전)
+
+    서로 다른 문장을 계속 보내도 디스크가 max_disk_bytes 이상 차지 않음.
+    """
+
+    def __init__(self, cache_dir, max_memory_bytes=32 * 1024 * 1024, max_disk_bytes=512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # key -> bytes
+        self._memory_bytes = 0
+        self._disk = OrderedDict()    # key -> 파일 크기, 오래 안 쓴 순
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        self._scan_disk()
+
+    def _scan_disk(self):
+        # 재시작 전에 쓴 파일도 용량에 포함 - 수정 시각이 오래된 것부터 삭제 후보
+        files = []
+        for path in self.cache_dir.glob('*.wav'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._unlink(self._evict_disk())
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        path = self.cache_dir / f"{key}.wav"
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._store_memory(key, data)
+        return data
+
+    def put(self, key, data):
+        # 임시 파일에 쓰고 rename → 다른 스레드가 반쯤 쓴 파일을 읽지 않음
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.cache_dir / f"{key}.wav")
+
+        with self._lock:
+            self._disk_bytes += len(data) - self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            victims = self._evict_disk()
+            self._store_memory(key, data)
+        self._unlink(victims)
+
+    def _evict_disk(self):
+        """용량을 넘은 만큼 오래 안 쓴 키를 색인에서 빼고 반환 (락 안에서 호출)"""
+        victims = []
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._memory_bytes -= len(self._memory.pop(key, b''))
+            victims.append(key)
+        self.disk_evictions += len(victims)
+        return victims
+
+    def _unlink(self, keys):
+        for key in keys:
+            try:
+                (self.cache_dir / f"{key}.wav").unlink()
+            except FileNotFoundError:
+                pass
+
+    def _store_memory(self, key, data):
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_items': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_items': len(self._disk),
+                'disk_bytes': self._disk_bytes,
+                'disk_evictions': self.disk_evictions
+            }
@@ -0,0 +1,41 @@
+"""
+변경 감지 JSON 파일 (patterns.json)
+- check_interval초에 한 번만 stat → mtime이 바뀌었을 때만 다시 읽어 rebuild(data) 호출
+- 검색 색인 / 채점 색인 / Day별 프롬프트가 같은 방식으로 patterns.json 수정을 반영
+"""
+
+import json
+import time
+import threading
+
+
+class WatchedJSON:
+    """JSON 파일 + 바뀌면 호출할 rebuild 콜백 (스레드 안전 - rebuild는 한 번에 하나만 실행)"""
+
+    def __init__(self, path, rebuild, check_interval=1.0):
+        self.path = path
+        self.rebuild = rebuild
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def refresh(self):
+        """파일이 바뀌었으면 다시 읽어 rebuild(data) - 파일이 없으면 이전 내용 유지"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = self.path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime == self._mtime:
+                return
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.rebuild(data)
+            self._mtime = mtime
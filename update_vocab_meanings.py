@@ -1,4 +1,12 @@
+import os
 import json
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+from functools import lru_cache
+
+from lemmatizer import InflectionIndex
 
 # 기초~중급 영한 사전 (패턴 영어에 자주 나오는 단어 위주)
 VOCAB_DICT = {
@@ -261,56 +269,216 @@ VOCAB_DICT = {
     "sometimes": "가끔", "often": "종종", "usually": "보통"
 }
 
-def update_meanings():
-    path = r'c:\Users\dbghkvud123\Desktop\사프\영어\콩단\data\patterns.json'
-    
+ROOT_DIR = Path(__file__).parent
+DEFAULT_DATA_PATH = ROOT_DIR / 'data' / 'patterns.json'
+DEFAULT_JS_PATH = ROOT_DIR / 'docs' / 'js' / 'data.js'
+DEFAULT_CHUNK_DIR = ROOT_DIR / 'docs' / 'data'
+DEFAULT_STATE_PATH = ROOT_DIR / 'data' / '.patterns_state.json'
+
+# single: docs/js/data.js 한 파일 / chunked: Day별 JSON + manifest / both: 둘 다
+OUTPUT_FORMATS = ('single', 'chunked', 'both')
+
+JS_PREFIX = b'const PATTERNS_DATA = '
+JS_SUFFIX = b';'
+
+
+def normalize_word(word):
+    """소문자 + 구두점 제거"""
+    return word.lower().replace('.', '').replace(',', '').replace('?', '').replace('!', '')
+
+
+@lru_cache(maxsize=1)
+def inflection_index():
+    """변화형 역색인 - 실제로 뜻을 찾을 때 한 번만 구축"""
+    return InflectionIndex(VOCAB_DICT)
+
+
+def lookup_meaning(word):
+    """사전에서 뜻 찾기 - 없으면 변화형 역색인으로 기본형을 찾음 (studies, stopped, making, went ...)"""
+    return inflection_index().meaning(word)
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_hash(obj):
+    return sha256(json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+
+def file_hash(path):
+    try:
+        return sha256(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def write_atomic(path, data):
+    """임시 파일에 쓰고 rename - 중간에 죽어도 반쯤 쓴 파일이 남지 않음"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp_path, 0o644)  # mkstemp는 0600으로 만들기 때문에 웹에서 읽을 수 있게
+    os.replace(tmp_path, path)
+
+
+def build_chunks(data):
+    """Day별 최소화 JSON + manifest → {파일 이름: 바이트}
+
+    manifest에는 Day 목록/제목/패턴 수와 각 chunk의 내용 해시가 들어가고,
+    프런트엔드는 이 해시를 쿼리스트링(?v=)으로 붙여 캐시를 무효화한다.
+    """
+    chunks = {}
+    manifest_days = []
+    for day in data['days']:
+        file_name = f"day-{day['day']}.json"
+        body = json.dumps(day, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        chunks[file_name] = body
+        manifest_days.append({
+            'day': day['day'],
+            'title': day.get('title', ''),
+            'patterns': len(day.get('patterns', [])),
+            'examples': sum(len(p.get('examples', [])) for p in day.get('patterns', [])),
+            'file': file_name,
+            'hash': sha256(body)[:12]
+        })
+
+    manifest = {k: v for k, v in data.items() if k != 'days'}
+    manifest['days'] = manifest_days
+    chunks['manifest.json'] = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return chunks
+
+
+STATE_VERSION = 2  # 2: 출력 경로를 ROOT_DIR 기준 상대 경로로 기록
+
+
+def state_key(path):
+    """state 파일에 적는 출력 경로 - 저장소 안이면 ROOT_DIR 기준 상대 경로 (다른 checkout에 복사해도 그 트리를 가리킴)"""
+    path = Path(path).resolve()
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        return path.relative_to(ROOT_DIR.resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def load_state(path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def update_meanings(data_path=DEFAULT_DATA_PATH, js_path=DEFAULT_JS_PATH, state_path=DEFAULT_STATE_PATH,
+                    force=False, output_format='both', chunk_dir=DEFAULT_CHUNK_DIR):
+    """단어 뜻 갱신 + data.js / Day별 chunk 재생성 (증분)
+
+    state 파일에 사전 해시, Day별 내용 해시, 출력 파일 해시를 기록해 두고
+    - 입력/출력/사전이 모두 그대로면 파싱도 하지 않고 종료
+    - 내용이 바뀐 Day만 다시 처리
+    - 직렬화는 한 번만 하고, 실제로 바뀐 파일만 원자적으로 다시 쓴다
+    """
+    data_path, js_path, state_path, chunk_dir = Path(data_path), Path(js_path), Path(state_path), Path(chunk_dir)
+
+    try:
+        raw = data_path.read_bytes()
     except FileNotFoundError:
         print("파일을 찾을 수 없습니다.")
         return
 
+    state = {} if force else load_state(state_path)
+    dict_hash = content_hash(VOCAB_DICT)
+    input_hash = sha256(raw)
+
+    if (state.get('version') == STATE_VERSION
+            and state.get('dict_hash') == dict_hash
+            and state.get('data_hash') == input_hash
+            and state.get('format') == output_format
+            and state.get('outputs')
+            and all(file_hash(ROOT_DIR / path) == digest for path, digest in state['outputs'].items())):
+        print("✅ 변경 사항 없음 - 건너뜀")
+        return
+
+    data = json.loads(raw)
+    day_hashes = state.get('days', {}) if state.get('dict_hash') == dict_hash else {}
+
     updated_count = 0
+    skipped_days = 0
     missing_words = []
+    new_day_hashes = {}
 
     for day in data['days']:
+        day_key = str(day['day'])
+        if day_hashes.get(day_key) == content_hash(day):
+            skipped_days += 1
+            new_day_hashes[day_key] = day_hashes[day_key]
+            continue
+
         if 'vocabulary' in day:
             for vocab in day['vocabulary']:
-                word = vocab['word'].lower()
-                # 구두점 제거
-                word = word.replace('.', '').replace(',', '').replace('?', '').replace('!', '')
-                
-                if word in VOCAB_DICT:
-                    vocab['meaning'] = VOCAB_DICT[word]
+                word = normalize_word(vocab['word'])
+                meaning = lookup_meaning(word)
+
+                if meaning is not None:
+                    vocab['meaning'] = meaning
                     updated_count += 1
                 else:
-                    # 사전에 없으면 기본형으로 시도 (s, ed, ing 제거)
-                    base_word = word
-                    if word.endswith('s') and word[:-1] in VOCAB_DICT: base_word = word[:-1]
-                    elif word.endswith('ed') and word[:-2] in VOCAB_DICT: base_word = word[:-2]
-                    elif word.endswith('ing') and word[:-3] in VOCAB_DICT: base_word = word[:-3]
-                    elif word.endswith('ly') and word[:-2] in VOCAB_DICT: base_word = word[:-2]
-                    
-                    if base_word in VOCAB_DICT:
-                        vocab['meaning'] = VOCAB_DICT[base_word]
-                        updated_count += 1
-                    else:
-                        missing_words.append(word)
-                        # 임시 뜻 유지 또는 '뜻 검색 필요'로 변경
-                        # vocab['meaning'] = "뜻 검색 필요" 
-
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    # data.js 업데이트
-    js_path = r'c:\Users\dbghkvud123\Desktop\사프\영어\콩단\docs\js\data.js'
-    with open(js_path, 'w', encoding='utf-8') as f:
-        f.write(f"const PATTERNS_DATA = {json.dumps(data, ensure_ascii=False, indent=2)};")
-
-    print(f"✅ 단어 뜻 업데이트 완료! (총 {updated_count}개)")
+                    missing_words.append(word)
+                    # 임시 뜻 유지 또는 '뜻 검색 필요'로 변경
+                    # vocab['meaning'] = "뜻 검색 필요" 
+
+        new_day_hashes[day_key] = content_hash(day)
+
+    # 한 번만 직렬화해서 patterns.json과 data.js에 같이 사용
+    output = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    outputs = {}
+    if output_format in ('single', 'both'):
+        outputs[js_path] = JS_PREFIX + output + JS_SUFFIX
+    if output_format in ('chunked', 'both'):
+        chunks = build_chunks(data)
+        outputs.update({chunk_dir / name: body for name, body in chunks.items()})
+        # 없어진 Day의 chunk 정리
+        for path in chunk_dir.glob('day-*.json'):
+            if path.name not in chunks:
+                path.unlink()
+
+    written = []
+    if output != raw:
+        write_atomic(data_path, output)
+        written.append(data_path.name)
+    for path, body in outputs.items():
+        if file_hash(path) != sha256(body):
+            write_atomic(path, body)
+            written.append(path.name)
+
+    write_atomic(state_path, json.dumps({
+        'version': STATE_VERSION,
+        'dict_hash': dict_hash,
+        'data_hash': sha256(output),
+        'format': output_format,
+        'outputs': {state_key(path): sha256(body) for path, body in outputs.items()},
+        'days': new_day_hashes
+    }, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    print(f"✅ 단어 뜻 업데이트 완료! (총 {updated_count}개, 변경 없는 Day {skipped_days}개 건너뜀)")
+    print(f"📝 다시 쓴 파일 ({len(written)}개): {', '.join(written[:8]) if written else '없음'}{' ...' if len(written) > 8 else ''}")
     if missing_words:
         print(f"⚠️ 사전에 없는 단어 ({len(missing_words)}개): {', '.join(missing_words[:10])}...")
 
+
+def main():
+    parser = argparse.ArgumentParser(description='patterns.json 단어 뜻 갱신 + docs/js/data.js, docs/data/ 재생성')
+    parser.add_argument('--data', type=Path, default=DEFAULT_DATA_PATH, help='patterns.json 경로')
+    parser.add_argument('--js', type=Path, default=DEFAULT_JS_PATH, help='생성할 data.js 경로')
+    parser.add_argument('--chunk-dir', type=Path, default=DEFAULT_CHUNK_DIR, help='Day별 chunk + manifest를 만들 폴더')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='both',
+                        help='single: data.js 한 파일, chunked: Day별 chunk, both: 둘 다 (기본)')
+    parser.add_argument('--state', type=Path, default=DEFAULT_STATE_PATH, help='증분 처리용 해시 기록 파일')
+    parser.add_argument('--force', action='store_true', help='해시 기록을 무시하고 전부 다시 처리')
+    args = parser.parse_args()
+
+    update_meanings(args.data, args.js, args.state, args.force, args.format, args.chunk_dir)
+
+
 if __name__ == "__main__":
-    update_meanings()
+    main()